@@ -1,82 +1,201 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, abort, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS # needs to be installed in pythonanywhere
-from config import num_keys, select_keys
-from config import props_path
-from rebar import RebarProperties, RebarBend
-from dev_lap import ConcreteBeam, RebarDevLap
+from config import ndjson_mimetype, profile_enabled, http_max_age
+from service import props_body, props_batch_body, dev_lap_body, dev_lap_batch_line, main_dev_lap_body, sweep_body, takeoff_body, bend_dims_body, grades_body, metrics_body, with_grade
+from service import props_etag, dev_lap_etag, grades_etag, case_errors, watch_data_tables
+from metrics import stage, timed, request_timer
+from jsonio import loads
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    JSON provider parsing request bodies with jsonio (orjson when installed).
+    Responses are serialized by service.py.
+    """
+    def loads(self, s, **kwargs):
+        return loads(s)
 
 app = Flask(__name__)
+app.json = JSONProvider(app)
 CORS(app)
+# reload data tables edited while serving
+table_watcher = watch_data_tables()
+
+def json_response(body):
+    return app.response_class(body, mimetype='application/json')
+
+def request_json():
+    with stage('json_parse'):
+        return request.json
+
+def request_graded_json():
+    """
+    Returns request body with f_y resolved from its grade, aborting on an unknown grade.
+    """
+    try:
+        return with_grade(request_json())
+    except ValueError as e:
+        abort(400, str(e))
+
+def conditional_response(etag, body):
+    """
+    Returns cacheable GET response, or 304 Not Modified when the client already
+    holds the current entity tag. Invalid or missing inputs abort with 400.
 
-def extract_data(data, float_keys, str_keys):
-    extracted_data = {}
-    for key in float_keys:
-        extracted_data[key] = float(data.get(key, 0))
-    for key in str_keys:
-        extracted_data[key] = data.get(key, '')
-    return extracted_data
+    Parameters:
+    - etag: Function returning the entity tag of the response.
+    - body: Function returning the response body.
+    """
+    try:
+        tag = etag()
+        # weak comparison, as RFC 9110 requires for If-None-Match
+        if request.if_none_match.contains_weak(tag):
+            response = app.response_class(status=304)
+        else:
+            response = json_response(body())
+    except case_errors as e:
+        abort(400, str(e))
+    response.set_etag(tag)
+    response.cache_control.public = True
+    response.cache_control.max_age = http_max_age
+    return response
 
 @app.route('/props', methods=['POST'])
+@timed('props')
 def props():
-    data = request.json
-    bar_type = data.get('type')
-    bar_size = data.get('size')
-    bar_bend = data.get('bend')
-    stirrup = bar_type == 'stirrup'
-
-    rebar = RebarProperties(bar_size, props_path, stirrup)
-    if bar_bend != 'None':
-        bend = RebarBend(rebar, int(bar_bend))
-        bend.set_bend_extension()
-        bend_dimension = bend.calc_bend_dimension() if bar_bend else None
-        add_length = bend.calc_add_length() if bar_bend else None
-    else:
-        bend_dimension = ''
-        add_length = ''
-
-    return jsonify({
-        'bar_diameter': rebar.bar_diameter,
-        'bar_area': rebar.bar_area,
-        'bar_weight': rebar.bar_weight,
-        'bar_perimeter': rebar.bar_perimeter,
-        'pin_diameter': rebar.pin_diameter,
-        'bend_dimension': bend_dimension,
-        'add_length': add_length
-    })
+    return json_response(props_body(request_json()))
+
+@app.route('/props', methods=['GET'])
+@timed('props_get')
+def props_get():
+    """
+    /props with the request body fields as query parameters, cacheable by
+    clients and CDNs and revalidated with a strong ETag.
+    """
+    data = request.args.to_dict()
+    return conditional_response(lambda: props_etag(data), lambda: props_body(data))
+
+@app.route('/props/batch', methods=['POST'])
+@timed('props_batch')
+def props_batch():
+    """
+    Accepts a JSON array of /props bodies and returns results in input order.
+    """
+    bars = request_json()
+    if not isinstance(bars, list):
+        abort(400, 'Expected a JSON array of bars.')
+    return json_response(props_batch_body(bars))
 
 @app.route('/dev-lap', methods=['POST'])
+@timed('dev_lap')
 def dev_lap():
-    data = request.json
-    values = extract_data(data, num_keys, select_keys)
-
-    beam = ConcreteBeam(
-        values['size'],
-        values['spacing'],
-        values['cover'],
-        values['f_c'], 
-        values['f_y'],
-        values['concDensity']
-        )
-
-    # development and lap
-    epoxy_coat = values['epoxy_coat'] != 'no'
-    top_bar = values['top_bar'] != 'no'
-    rebar = RebarDevLap(
-        beam, 
-        epoxy_coat, 
-        top_bar, 
-        values['lambda_er']
-        )
-    rebar.calc_tension_dev_len()
-    rebar.calc_hook_dev_len()
-    rebar.calc_tension_lap_len()
-    output = rebar.print_dev_lap()
-
-    return jsonify({
-        'tension_development': output['tension_development'],
-        'tension_hook_development': output['tension_hook_development'],
-        'tension_splice': output['tension_splice']
-    })
+    return json_response(dev_lap_body(request_graded_json()))
+
+@app.route('/dev-lap', methods=['GET'])
+@timed('dev_lap_get')
+def dev_lap_get():
+    """
+    /dev-lap with the request body fields as query parameters, cacheable by
+    clients and CDNs and revalidated with a strong ETag.
+    """
+    try:
+        data = with_grade(request.args.to_dict())
+    except ValueError as e:
+        abort(400, str(e))
+    return conditional_response(lambda: dev_lap_etag(data), lambda: dev_lap_body(data))
+
+@app.route('/dev-lap/main', methods=['POST'])
+@timed('dev_lap_main')
+def dev_lap_main():
+    """
+    Tension, hook and compression lengths of main reinforcement, with bundled
+    bars (bundle), required steel area (As_req), lap class and lambda_rc/m factors.
+    """
+    data = request_graded_json()
+    try:
+        body = main_dev_lap_body(data)
+    except case_errors as e:
+        abort(400, str(e))
+    return json_response(body)
+
+@app.route('/dev-lap/batch', methods=['POST'])
+def dev_lap_batch():
+    """
+    Accepts a JSON array or NDJSON stream of /dev-lap cases and streams one
+    NDJSON result line per case, with per-case errors reported inline.
+    """
+    if request.mimetype == ndjson_mimetype:
+        # parsed line by line so the request body is never held in memory
+        cases = (line for line in request.stream if line.strip())
+    else:
+        cases = request_json()
+        if not isinstance(cases, list):
+            abort(400, 'Expected a JSON array of cases.')
+
+    def generate():
+        # timed while streaming, the view itself only returns the generator
+        with request_timer('dev_lap_batch'):
+            for index, data in enumerate(cases):
+                yield dev_lap_batch_line(index, data)
+
+    return app.response_class(stream_with_context(generate()), mimetype=ndjson_mimetype)
+
+@app.route('/dev-lap/sweep', methods=['POST'])
+@timed('dev_lap_sweep')
+def dev_lap_sweep():
+    """
+    Returns Pareto set of bar size and spacing designs with the least steel area
+    per foot and shortest required length, meeting a maximum length and minimum
+    steel area, for fixed concrete and steel inputs.
+    """
+    try:
+        body = sweep_body(request_json())
+    except (ValueError, TypeError) as e:
+        abort(400, str(e))
+    return json_response(body)
+
+@app.route('/takeoff', methods=['POST'])
+@timed('takeoff')
+def takeoff():
+    """
+    Accepts a JSON array of bar marks and returns bar count, developed length
+    and weight totals per bar size.
+    """
+    items = request_json()
+    if not isinstance(items, list):
+        abort(400, 'Expected a JSON array of bar marks.')
+    try:
+        body = takeoff_body(items)
+    except (ValueError, TypeError) as e:
+        abort(400, str(e))
+    return json_response(body)
+
+@app.route('/bend-dims', methods=['POST'])
+@timed('bend_dims')
+def bend_dims():
+    """
+    Returns standard hook detailing dimensions (D, A, B, C) for a bar size,
+    bend and type (stirrups and ties use the bends_other table).
+    """
+    try:
+        body = bend_dims_body(request_json())
+    except (ValueError, TypeError) as e:
+        abort(400, str(e))
+    return json_response(body)
+
+@app.route('/grades', methods=['GET'])
+@timed('grades')
+def grades():
+    """
+    Returns yield strength (f_y) and gamma_3 of each grade accepted as 'grade'
+    by the /dev-lap endpoints.
+    """
+    return conditional_response(grades_etag, grades_body)
+
+if profile_enabled:
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return app.response_class(metrics_body(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,331 @@
+"""
+ASGI entry point serving the same routes as app.py, e.g.:
+
+    uvicorn asgi:app --workers 4
+"""
+import asyncio
+import logging
+from urllib.parse import parse_qsl
+from jsonio import loads
+from metrics import request_timer
+from config import ndjson_mimetype, profile_enabled, http_max_age, batch_chunk_size
+from service import props_body, props_batch_body, dev_lap_body, dev_lap_batch_line, main_dev_lap_body, sweep_body, takeoff_body, bend_dims_body, grades_body, metrics_body, with_grade
+from service import props_etag, dev_lap_etag, grades_etag, case_errors, watch_data_tables
+
+# methods advertised to CORS preflight requests (flask_cors default)
+cors_methods = b'DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT'
+
+logger = logging.getLogger(__name__)
+# reload data tables edited while serving, stopped on lifespan shutdown
+table_watcher = watch_data_tables()
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+async def read_body(receive):
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+async def read_json(receive):
+    try:
+        return loads(await read_body(receive))
+    except ValueError:
+        raise HTTPError(400, 'Failed to decode JSON object.')
+
+async def read_graded_json(receive):
+    try:
+        return with_grade(await read_json(receive))
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+
+async def iter_line_batches(receive):
+    """
+    Yields lists of the non-empty request body lines completed by each received
+    chunk. A partial line is kept as a list of chunks and joined once complete.
+    """
+    pending = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunk = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if b'\n' not in chunk:
+            pending.append(chunk)
+            continue
+        *lines, rest = b''.join(pending + [chunk]).split(b'\n')
+        pending = [rest]
+        lines = [line for line in lines if line.strip()]
+        if lines:
+            yield lines
+    last = b''.join(pending)
+    if last.strip():
+        yield [last]
+
+def cors_headers(headers):
+    """
+    Returns CORS response headers, matching flask_cors defaults.
+    """
+    origin = headers.get(b'origin')
+    if origin is None:
+        return [(b'access-control-allow-origin', b'*')]
+    return [(b'access-control-allow-origin', origin), (b'vary', b'Origin')]
+
+async def send_response(send, status, body, content_type, headers):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers + [
+            (b'content-type', content_type),
+            (b'content-length', str(len(body)).encode())
+            ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def query_data(scope):
+    """
+    Returns query parameters as a dict, keeping the first value of repeated keys (as Flask's args.to_dict).
+    """
+    data = {}
+    for key, value in parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True):
+        data.setdefault(key, value)
+    return data
+
+def etag_matches(if_none_match, tag):
+    """
+    Returns True if an If-None-Match header value holds the entity tag, using
+    the weak comparison RFC 9110 requires (W/ prefixes are ignored).
+    """
+    if if_none_match.strip() == b'*':
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(b','))
+    return f'"{tag}"'.encode() in (candidate.removeprefix(b'W/') for candidate in candidates)
+
+def without_body(send):
+    """
+    Returns send function dropping the response body, to answer HEAD requests
+    with the headers of the GET response.
+    """
+    async def send_headers(message):
+        if message['type'] == 'http.response.body':
+            message = {**message, 'body': b''}
+        await send(message)
+    return send_headers
+
+async def send_conditional(send, headers, request_headers, etag, body):
+    """
+    Sends cacheable GET response, or 304 Not Modified when the client already
+    holds the current entity tag.
+
+    Parameters:
+    - etag: Function returning the entity tag of the response.
+    - body: Function returning the response body.
+    """
+    try:
+        tag = etag()
+        not_modified = etag_matches(request_headers.get(b'if-none-match', b''), tag)
+        if not not_modified:
+            content = body()
+    except case_errors as e:
+        raise HTTPError(400, str(e))
+    headers = headers + [
+        (b'etag', f'"{tag}"'.encode()),
+        (b'cache-control', f'public, max-age={http_max_age}'.encode())
+    ]
+    if not_modified:
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+    else:
+        await send_response(send, 200, content, b'application/json', headers)
+
+async def props_get(data, send, headers, request_headers):
+    await send_conditional(send, headers, request_headers, lambda: props_etag(data), lambda: props_body(data))
+
+async def dev_lap_get(data, send, headers, request_headers):
+    try:
+        data = with_grade(data)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    await send_conditional(send, headers, request_headers, lambda: dev_lap_etag(data), lambda: dev_lap_body(data))
+
+async def grades(data, send, headers, request_headers):
+    await send_conditional(send, headers, request_headers, grades_etag, grades_body)
+
+async def props(receive, send, headers):
+    body = props_body(await read_json(receive))
+    await send_response(send, 200, body, b'application/json', headers)
+
+async def props_batch(receive, send, headers):
+    bars = await read_json(receive)
+    if not isinstance(bars, list):
+        raise HTTPError(400, 'Expected a JSON array of bars.')
+    body = await asyncio.to_thread(props_batch_body, bars)
+    await send_response(send, 200, body, b'application/json', headers)
+
+async def dev_lap(receive, send, headers):
+    body = dev_lap_body(await read_graded_json(receive))
+    await send_response(send, 200, body, b'application/json', headers)
+
+async def dev_lap_main(receive, send, headers):
+    data = await read_graded_json(receive)
+    try:
+        body = main_dev_lap_body(data)
+    except case_errors as e:
+        raise HTTPError(400, str(e))
+    await send_response(send, 200, body, b'application/json', headers)
+
+def batch_lines(start, cases):
+    """
+    Returns the joined /dev-lap/batch result lines of cases numbered from start.
+    """
+    return b''.join(dev_lap_batch_line(start + offset, data) for offset, data in enumerate(cases))
+
+async def dev_lap_batch(receive, send, headers, content_type):
+    # cases are calculated on worker threads, chunk by chunk, so a large
+    # batch does not stall other connections on the event loop
+    if content_type == ndjson_mimetype:
+        chunks = iter_line_batches(receive)
+    else:
+        cases = await read_json(receive)
+        if not isinstance(cases, list):
+            raise HTTPError(400, 'Expected a JSON array of cases.')
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': headers + [(b'content-type', ndjson_mimetype.encode())]
+    })
+    if content_type == ndjson_mimetype:
+        index = 0
+        async for lines in chunks:
+            for start in range(0, len(lines), batch_chunk_size):
+                chunk = lines[start:start + batch_chunk_size]
+                body = await asyncio.to_thread(batch_lines, index, chunk)
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+                index += len(chunk)
+    else:
+        for start in range(0, len(cases), batch_chunk_size):
+            body = await asyncio.to_thread(batch_lines, start, cases[start:start + batch_chunk_size])
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+async def dev_lap_sweep(receive, send, headers):
+    data = await read_json(receive)
+    try:
+        body = await asyncio.to_thread(sweep_body, data)
+    except (ValueError, TypeError) as e:
+        raise HTTPError(400, str(e))
+    await send_response(send, 200, body, b'application/json', headers)
+
+async def takeoff(receive, send, headers):
+    items = await read_json(receive)
+    if not isinstance(items, list):
+        raise HTTPError(400, 'Expected a JSON array of bar marks.')
+    try:
+        body = await asyncio.to_thread(takeoff_body, items)
+    except (ValueError, TypeError) as e:
+        raise HTTPError(400, str(e))
+    await send_response(send, 200, body, b'application/json', headers)
+
+async def bend_dims(receive, send, headers):
+    data = await read_json(receive)
+    try:
+        body = bend_dims_body(data)
+    except (ValueError, TypeError) as e:
+        raise HTTPError(400, str(e))
+    await send_response(send, 200, body, b'application/json', headers)
+
+routes = {
+    '/props': props,
+    '/props/batch': props_batch,
+    '/dev-lap': dev_lap,
+    '/dev-lap/main': dev_lap_main,
+    '/dev-lap/batch': dev_lap_batch,
+    '/dev-lap/sweep': dev_lap_sweep,
+    '/takeoff': takeoff,
+    '/bend-dims': bend_dims
+}
+
+# cacheable GET routes, taking the request body fields as query parameters
+get_routes = {
+    '/props': props_get,
+    '/dev-lap': dev_lap_get,
+    '/grades': grades
+}
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if table_watcher is not None:
+                table_watcher.set()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    request_headers = dict(scope['headers'])
+    headers = cors_headers(request_headers)
+    method = scope['method']
+    route = routes.get(scope['path'])
+    get_route = get_routes.get(scope['path'])
+    allowed = b', '.join(
+        name for name, handler in ((b'GET', get_route), (b'HEAD', get_route), (b'OPTIONS', True), (b'POST', route)) if handler
+        )
+
+    if profile_enabled and scope['path'] == '/metrics' and method == 'GET':
+        await send_response(send, 200, metrics_body(), b'text/plain; version=0.0.4', headers)
+        return
+    if route is None and get_route is None:
+        await send_response(send, 404, b'Not Found', b'text/plain; charset=utf-8', headers)
+        return
+    if method == 'OPTIONS':
+        allow = [(b'allow', allowed)]
+        if b'access-control-request-method' in request_headers:
+            allow += [(b'access-control-allow-methods', cors_methods)]
+            if b'access-control-request-headers' in request_headers:
+                allow += [(b'access-control-allow-headers', request_headers[b'access-control-request-headers'])]
+        await send_response(send, 200, b'', b'text/plain; charset=utf-8', headers + allow)
+        return
+    if method in ('GET', 'HEAD') and get_route is not None:
+        if method == 'HEAD':
+            send = without_body(send)
+        # timed per handler, named as the Flask endpoints
+        with request_timer(get_route.__name__):
+            try:
+                await get_route(query_data(scope), send, headers, request_headers)
+            except HTTPError as e:
+                await send_response(send, e.status, str(e).encode(), b'text/plain; charset=utf-8', headers)
+            except Exception:
+                logger.exception('Exception on %s [%s]', scope['path'], method)
+                await send_response(send, 500, b'Internal Server Error', b'text/plain; charset=utf-8', headers)
+        return
+    if method != 'POST' or route is None:
+        await send_response(send, 405, b'Method Not Allowed', b'text/plain; charset=utf-8', headers + [(b'allow', allowed)])
+        return
+
+    with request_timer(route.__name__):
+        try:
+            if route is dev_lap_batch:
+                content_type = request_headers.get(b'content-type', b'').split(b';')[0].strip().decode('latin-1')
+                await dev_lap_batch(receive, send, headers, content_type)
+            else:
+                await route(receive, send, headers)
+        except HTTPError as e:
+            await send_response(send, e.status, str(e).encode(), b'text/plain; charset=utf-8', headers)
+        except Exception:
+            logger.exception('Exception on %s [%s]', scope['path'], method)
+            await send_response(send, 500, b'Internal Server Error', b'text/plain; charset=utf-8', headers)
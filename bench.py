@@ -0,0 +1,203 @@
+"""
+Benchmarks for the calculation core and HTTP endpoints.
+
+    python bench.py -o bench.json
+    python bench.py --filter dev_lap --compare bench.json
+
+Each benchmark is run over a grid of inputs with timeit and reported as JSON
+(per-call latency in seconds and calls per second), tagged with the git commit.
+Cold start (time to import app.py in a fresh interpreter) is reported as well.
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from config import props_path
+from rebar import RebarProperties, RebarBend
+from dev_lap import ConcreteBeam, RebarDevLap
+from unit_conversion import return_ft_in, return_feet, format_ft_in, parse_feet
+
+bar_sizes = ['#3', '#8', '#18']
+
+def bench_rebar_properties(bar_size, stirrup):
+    def run():
+        rebar = RebarProperties(bar_size, props_path, stirrup)
+        return rebar.bar_diameter, rebar.bar_area, rebar.bar_weight, rebar.bar_perimeter
+    return run
+
+def bench_rebar_bend(bar_size, bar_bend):
+    rebar = RebarProperties(bar_size, props_path)
+    def run():
+        bend = RebarBend(rebar, bar_bend)
+        bend.set_bend_extension()
+        return bend.calc_bend_dimension(), bend.calc_add_length()
+    return run
+
+def bench_rebar_dev_lap(bar_size, epoxy_coat, top_bar):
+    def run():
+        beam = ConcreteBeam(bar_size, 12, 2, 4, 60, 150)
+        rebar = RebarDevLap(beam, epoxy_coat, top_bar)
+        rebar.calc_tension_dev_len()
+        rebar.calc_hook_dev_len()
+        rebar.calc_tension_lap_len()
+        return rebar.print_dev_lap()
+    return run
+
+def bench_return_ft_in(number_ft):
+    return lambda: return_ft_in(number_ft, multiple=1, direction='up')
+
+def bench_format_ft_in(number_ft):
+    # uncached to measure the formatting itself
+    return lambda: format_ft_in.__wrapped__(number_ft, multiple=1, direction='up')
+
+def bench_return_feet(string_num):
+    # uncached to measure the parsing itself
+    def run():
+        parse_feet.cache_clear()
+        return return_feet(string_num)
+    return run
+
+def client():
+    from app import app
+    return app.test_client()
+
+def bench_props_route(bar_type, bar_bend):
+    test_client = client()
+    body = {'type': bar_type, 'size': '#5', 'bend': bar_bend}
+    return lambda: test_client.post('/props', json=body).data
+
+def bench_dev_lap_route(cached):
+    from service import dev_lap_cache
+    test_client = client()
+    body = {
+        'size': '#5', 'spacing': 12, 'cover': 2, 'f_c': 4, 'f_y': 60,
+        'concDensity': 150, 'lambda_er': 1, 'epoxy_coat': 'no', 'top_bar': 'no'
+    }
+    def run():
+        if not cached:
+            dev_lap_cache.clear()
+        return test_client.post('/dev-lap', json=body).data
+    return run
+
+# name: (benchmark factory, parameter grid)
+benchmarks = {
+    'rebar_properties': (bench_rebar_properties, {'bar_size': bar_sizes, 'stirrup': [False, True]}),
+    'rebar_bend': (bench_rebar_bend, {'bar_size': bar_sizes, 'bar_bend': [90, 180]}),
+    'rebar_dev_lap': (bench_rebar_dev_lap, {'bar_size': bar_sizes, 'epoxy_coat': [False, True], 'top_bar': [False, True]}),
+    'return_ft_in': (bench_return_ft_in, {'number_ft': [0.5, 12.3456, 999.99]}),
+    'format_ft_in': (bench_format_ft_in, {'number_ft': [0.5, 12.3456, 999.99]}),
+    'return_feet': (bench_return_feet, {'string_num': ['12', '5\'-6 1/2"', '6.5"', '5\' - 6"']}),
+    'props_route': (bench_props_route, {'bar_type': ['main', 'stirrup'], 'bar_bend': ['None', '90']}),
+    'dev_lap_route': (bench_dev_lap_route, {'cached': [False, True]}),
+}
+
+def run_benchmark(name, params, run, number, repeat):
+    """
+    Times run() and returns result record.
+
+    Parameters:
+    - name: Benchmark name.
+    - params: Input parameters of this grid point.
+    - run: Callable to time.
+    - number: Calls per timing.
+    - repeat: Number of timings.
+    """
+    run()  # warm up
+    times = [t / number for t in timeit.repeat(run, number=number, repeat=repeat)]
+    return {
+        'name': name,
+        'params': params,
+        'number': number,
+        'repeat': repeat,
+        'best_s': min(times),
+        'median_s': statistics.median(times),
+        'ops_per_s': 1 / min(times)
+    }
+
+def run_benchmarks(names, number, repeat):
+    results = []
+    for name in names:
+        factory, grid = benchmarks[name]
+        for combo in itertools.product(*grid.values()):
+            params = dict(zip(grid.keys(), combo))
+            results.append(run_benchmark(name, params, factory(**params), number, repeat))
+    return results
+
+# imports app.py in a fresh interpreter and reports import time and heavy modules loaded
+cold_start_script = """
+import json, sys, time
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+print(json.dumps({'seconds': seconds, 'modules': [m for m in ('numpy', 'pandas') if m in sys.modules]}))
+"""
+
+def measure_cold_start(runs):
+    """
+    Returns cold start record from importing app.py in runs fresh interpreters.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', cold_start_script], capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.splitlines()[-1]))
+    times = [sample['seconds'] for sample in samples]
+    return {
+        'runs': runs,
+        'best_s': min(times),
+        'median_s': statistics.median(times),
+        'heavy_modules': samples[-1]['modules']
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    """
+    Prints per-benchmark speed ratio against a previous results file (>1 is faster).
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in json.load(f)['results']}
+    for result in results:
+        key = (result['name'], json.dumps(result['params'], sort_keys=True))
+        if key in baseline:
+            ratio = baseline[key]['best_s'] / result['best_s']
+            print(f"{result['name']:<18} {key[1]:<60} {ratio:6.2f}x", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='write JSON results to file (default: stdout)')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+    parser.add_argument('--number', type=int, default=1000, help='calls per timing')
+    parser.add_argument('--repeat', type=int, default=5, help='timings per grid point')
+    parser.add_argument('--cold-start-runs', type=int, default=5, help='fresh interpreters timed for cold start (0 to skip)')
+    parser.add_argument('--compare', metavar='BASELINE', help='print speed ratios against a previous results file')
+    args = parser.parse_args(argv)
+
+    names = [name for name in benchmarks if args.filter in name]
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run_benchmarks(names, args.number, args.repeat)
+    }
+    if args.cold_start_runs:
+        report['cold_start'] = measure_cold_start(args.cold_start_runs)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        compare(report['results'], args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a time-to-live, used for serialized responses.
+
+    Parameters:
+    - maxsize: Maximum number of entries kept.
+    - ttl: Seconds an entry stays valid.
+
+    Unhashable keys are treated as uncacheable (always a miss).
+    """
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Returns cached value for key, or None if missing or expired.
+        """
+        with self._lock:
+            try:
+                entry = self._entries.get(key)
+            except TypeError:
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores value for key, evicting the least recently used entries over maxsize.
+        """
+        with self._lock:
+            try:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            except TypeError:
+                return
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns dict of cache size and hit/miss/eviction counters.
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
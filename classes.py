@@ -1,50 +1,47 @@
-import pandas as pd
-import math, os
+import math
+from config import props_path, bends_main_path, bends_other_path
+from tables import get_bar_props, get_bend_dims
+from rebar import calc_b_dim
+from dev_lap import calc_steel_area, calc_lambda_er, calc_bundle_factor, calc_l_dbc, calc_comp_lap
+
+def dim_to_str(dim):
+    """
+    Formats table value as written in the data files, '-' where not applicable.
+    """
+    return '-' if dim is None else f'{dim:g}'
+
+def bend_dims_dict(bar_diameter, bend_dims):
+    """
+    Returns D, A, B and C detailing dimensions of a hook.
+    """
+    B = calc_b_dim(bar_diameter, bend_dims.D, int(bend_dims.bar_bend))
+    return {
+        'D': dim_to_str(bend_dims.D),
+        'A': dim_to_str(bend_dims.A),
+        'B': '-' if B is None else B,
+        'C': dim_to_str(bend_dims.C)
+    }
 
 class OtherRebarProperties:
 
     def __init__(self, bar_size):
         self.bar_size = bar_size
-        self.bar_props_df = pd.read_csv(os.getcwd() + '/eng_apps/apps/rebar/data/props.csv', dtype=str)
-        self.bar_bends_df = pd.read_csv(os.getcwd() + '/eng_apps/apps/rebar/data/bends_other.csv', dtype=str)
-        self.prop_table = self.bar_props_df[self.bar_props_df['bar_size'] == self.bar_size]
+        self.bar_props = get_bar_props(self.bar_size, props_path)
+        self.bar_diameter = self.bar_props.bar_diameter
 
     def return_bar_properties(self):
-        self.bar_diameter = float(self.prop_table['bar_diameter'].values[0])
-
         props_dict = {
             'Bar Diameter (in)': str(self.bar_diameter),
-            'Bar Area (in²)': self.prop_table['bar_area'].values[0],
-            'Bar Weight (plf)': self.prop_table['bar_weight'].values[0],
-            'Bar Perimeter (in)': self.prop_table['bar_perimeter'].values[0],
+            'Bar Area (in²)': dim_to_str(self.bar_props.bar_area),
+            'Bar Weight (plf)': dim_to_str(self.bar_props.bar_weight),
+            'Bar Perimeter (in)': dim_to_str(self.bar_props.bar_perimeter),
         }
         return props_dict
 
 
     def return_bend_dims(self, bar_bend):
-
-        bend_table = self.bar_bends_df[
-            (self.bar_bends_df['bar_size'] == self.bar_size) &
-            (self.bar_bends_df['bar_bend'] == bar_bend)
-        ]
-
-        pin_diameter = bend_table['D'].values[0]
-        # calculate B dimension
-        if bar_bend == '180':
-            B = max(4 * self.bar_diameter + 0.5 * float(pin_diameter) + self.bar_diameter, 2.5)
-        elif bar_bend == '135':
-            B = max(6 * self.bar_diameter + 0.5 * float(pin_diameter) + self.bar_diameter, 2.5)
-        else:
-            B = '-'
-
-        bend_dict = {
-            'D': pin_diameter,
-            'A': bend_table['A'].values[0],
-            'B': B,
-            'C': bend_table['C'].values[0]
-        }
-
-        return bend_dict
+        bend_dims = get_bend_dims(self.bar_size, bar_bend, bends_other_path)
+        return bend_dims_dict(self.bar_diameter, bend_dims)
 
 
 class MainRebarProperties:
@@ -53,13 +50,11 @@ class MainRebarProperties:
         self.bar_size = bar_size
         self.bar_spacing = float(bar_spacing)
         self.bar_bundle = int(bar_bundle)
-        self.bar_props_df = pd.read_csv(os.getcwd() + '/eng_apps/apps/rebar/data/props.csv', dtype=str)
-        self.bar_bends_df = pd.read_csv(os.getcwd() + '/eng_apps/apps/rebar/data/bends_main.csv', dtype=str)
 
-        self.prop_table = self.bar_props_df[self.bar_props_df['bar_size'] == self.bar_size]
-        self.bar_diameter = float(self.prop_table['bar_diameter'].values[0])
-        self.bar_area = float(self.prop_table['bar_area'].values[0])
-        self.steel_area = round(self.bar_area * self.bar_bundle * 12 / self.bar_spacing, 2)
+        self.bar_props = get_bar_props(self.bar_size, props_path)
+        self.bar_diameter = self.bar_props.bar_diameter
+        self.bar_area = self.bar_props.bar_area
+        self.steel_area = calc_steel_area(self.bar_area, self.bar_spacing, self.bar_bundle)
 
 
     def in_to_ft_in(self, in_inches):
@@ -72,8 +67,8 @@ class MainRebarProperties:
         props_dict = {
             'Bar Diameter (in)': str(self.bar_diameter),
             'Bar Area (in²)': str(self.bar_area),
-            'Bar Weight (plf)': self.prop_table['bar_weight'].values[0],
-            'Bar Perimeter (in)': self.prop_table['bar_perimeter'].values[0],
+            'Bar Weight (plf)': dim_to_str(self.bar_props.bar_weight),
+            'Bar Perimeter (in)': dim_to_str(self.bar_props.bar_perimeter),
             'As (in²/ft)': self.steel_area
         }
 
@@ -90,24 +85,8 @@ class MainRebarProperties:
             }
 
         else:
-            bend_table = self.bar_bends_df[
-                (self.bar_bends_df['bar_size'] == self.bar_size) &
-                (self.bar_bends_df['bar_bend'] == bar_bend)
-            ]
-
-            pin_diameter = bend_table['D'].values[0]
-            # calculate B dimension
-            if bar_bend == '180':
-                B = max(4 * self.bar_diameter + 0.5 * float(pin_diameter) + self.bar_diameter, 2.5)
-            else:
-                B = '-'
-
-            bend_dict = {
-                'D': pin_diameter,
-                'A': bend_table['A'].values[0],
-                'B': B,
-                'C': bend_table['C'].values[0]
-            }
+            bend_dims = get_bend_dims(self.bar_size, bar_bend, bends_main_path)
+            bend_dict = bend_dims_dict(self.bar_diameter, bend_dims)
 
         return bend_dict
 
@@ -139,10 +118,7 @@ class MainRebarProperties:
         c_b = min(0.5 * self.bar_diameter + bar_cover, 0.5 * self.bar_spacing)
         lambda_rc = min(max(self.bar_diameter / c_b, 0.4), 1)
 
-        if As_req:
-            lambda_er = As_req / self.steel_area
-        else:
-            lambda_er = 1
+        lambda_er = calc_lambda_er(As_req, self.steel_area)
 
         if lambda_rl * lambda_cf <= 1.7:
             l_d = max(l_db*lambda_rl*lambda_cf*lambda_rc*lambda_er/lambda_, 12)
@@ -155,10 +131,7 @@ class MainRebarProperties:
         else:
             l_t = max(1.3 * l_d, 12)
 
-        if self.bar_bundle == 4:
-            l_t = 1.33 * l_t
-        elif self.bar_bundle == 3:
-            l_t = 1.2 * l_t
+        l_t = calc_bundle_factor(self.bar_bundle) * l_t
 
         return {'Development Length': self.in_to_ft_in(math.ceil(l_d)), 'Lap Splice Length': self.in_to_ft_in(math.ceil(l_t))}
 
@@ -177,10 +150,7 @@ class MainRebarProperties:
         else:
             lambda_cw = 1.2
 
-        if As_req:
-            lambda_er = As_req / self.steel_area
-        else:
-            lambda_er = 1
+        lambda_er = calc_lambda_er(As_req, self.steel_area)
 
         l_dh = max(l_hb*lambda_rc*lambda_cw*lambda_er/lambda_, 8 * self.bar_diameter, 6)
 
@@ -189,24 +159,13 @@ class MainRebarProperties:
 
     def return_compression_lengths(self, f_c, fy, lambda_rc, m, As_req):
         # development
-        l_db = max((0.63 * self.bar_diameter * fy) / math.sqrt(f_c), 0.3 * self.bar_diameter * fy)
+        l_db = calc_l_dbc(self.bar_diameter, f_c, fy)
 
-        if As_req:
-            lambda_er = As_req / self.steel_area
-        else:
-            lambda_er = 1
+        lambda_er = calc_lambda_er(As_req, self.steel_area)
 
         l_d = max(l_db*lambda_er*lambda_rc, 8)
 
         # lap
-        if fy <= 60:
-            l_c = max(0.5 * m * fy * self.bar_diameter, 12)
-        else:
-            l_c = max(m * (0.9 * fy - 24) * self.bar_diameter, 12)
-
-        if self.bar_bundle == 4:
-            l_c = 1.33 * l_c
-        elif self.bar_bundle == 3:
-            l_c = 1.2 * l_c
+        l_c = calc_bundle_factor(self.bar_bundle) * calc_comp_lap(self.bar_diameter, fy, m)
 
         return {'Development Length': self.in_to_ft_in(math.ceil(l_d)), 'Lap Splice Length': self.in_to_ft_in(math.ceil(l_c))}
@@ -0,0 +1,56 @@
+"""
+Command-line bulk calculator, streaming a csv of rebar cases without the server.
+
+    python cli.py < cases.csv > results.csv
+    python cli.py cases.csv -o results.csv --workers 4
+
+Input columns are the /props fields (size, type, bend) and, optionally, the
+/dev-lap fields (num_keys and select_keys from config.py). Each row is written
+with its rebar properties, bend dimensions and development and lap lengths as
+soon as it is calculated (see jobs.calc_case), so input of any length is
+processed in constant memory.
+"""
+import argparse
+import csv
+import sys
+from jobs import calc_case, iter_chunks, run_chunks, output_fieldnames
+
+def calc_rows(rows, workers=1, chunksize=100):
+    """
+    Yields results of cases in input order, one at a time or, with more than
+    one worker, in chunks calculated on a process pool.
+    """
+    if workers <= 1:
+        yield from map(calc_case, rows)
+        return
+    for results in run_chunks(iter_chunks(rows, chunksize), workers):
+        yield from results
+
+def main():
+    parser = argparse.ArgumentParser(description='Calculate a csv of rebar cases.')
+    parser.add_argument('input', nargs='?', default='-', help='cases csv (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='results csv (default: stdout)')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes')
+    parser.add_argument('--chunksize', type=int, default=100, help='cases per work unit with workers')
+    args = parser.parse_args()
+
+    infile = sys.stdin if args.input == '-' else open(args.input, newline='')
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    try:
+        reader = csv.DictReader(infile)
+        writer = csv.DictWriter(outfile, output_fieldnames(reader.fieldnames), extrasaction='ignore')
+        writer.writeheader()
+        for result in calc_rows(reader, args.workers, args.chunksize):
+            writer.writerow(result)
+        outfile.flush()
+    except BrokenPipeError:
+        # output closed early, e.g. piped to head
+        sys.stderr.close()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+if __name__ == '__main__':
+    main()
@@ -16,10 +16,60 @@ select_keys = [
     'top_bar'
 ]
 
+# main reinforcement input (/dev-lap/main), with num_keys and select_keys
+main_num_keys = [
+    'bundle',
+    'As_req',
+    'lambda_rc',
+    'm'
+]
+main_select_keys = [
+    'lap_class'
+]
+
 # rebar properties
 local_props_path = '/data/props.csv'
 # rebar grade
 local_grade_path = '/data/grade.csv'
+# standard hook dimensions
+local_bends_main_path = '/data/bends_main.csv'
+local_bends_other_path = '/data/bends_other.csv'
 
 props_path = os.getcwd() + local_props_path
-grade_path = os.getcwd() + local_grade_path
\ No newline at end of file
+grade_path = os.getcwd() + local_grade_path
+bends_main_path = os.getcwd() + local_bends_main_path
+bends_other_path = os.getcwd() + local_bends_other_path
+
+# /dev-lap response cache (entries, seconds)
+dev_lap_cache_size = 4096
+dev_lap_cache_ttl = 3600
+
+# Cache-Control max-age (s) of GET responses, revalidated with their ETag
+http_max_age = 300
+
+# seconds between checks of the data tables for changes, reloaded without a restart (0 disables)
+table_reload_interval = 2
+
+# precomputed /dev-lap result cube, built with python cube.py and memory-mapped
+# by every worker when present; requests off these axes are calculated live
+cube_path = os.getcwd() + '/data/dev_lap_cube.npy'
+cube_spacings = [3 + 0.5 * i for i in range(31)]
+cube_covers = [0.75, 1, 1.25, 1.5, 2, 2.5, 3]
+cube_f_c = [3, 4, 5, 6, 8, 10]
+cube_f_y = [40, 60, 75, 80, 100]
+cube_densities = [100, 110, 115, 120, 145, 150]
+
+# spacing grid searched by /dev-lap/sweep (in)
+sweep_spacings = [3 + 0.5 * i for i in range(31)]
+
+# opt-in request profiling, enabled with REBAR_PROFILE=1
+profile_enabled = os.environ.get('REBAR_PROFILE') == '1'
+# fraction of requests run under cProfile, dumped when slower than slow_request_seconds
+profile_sample_rate = 0.01
+slow_request_seconds = 0.05
+profile_dir = os.getcwd() + '/profiles'
+
+# streaming batch responses
+ndjson_mimetype = 'application/x-ndjson'
+# /dev-lap/batch cases calculated per worker thread call by the ASGI app
+batch_chunk_size = 256
\ No newline at end of file
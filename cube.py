@@ -0,0 +1,120 @@
+"""
+Precomputed /dev-lap result cube.
+
+    python cube.py
+
+Evaluates tension development, hook development and tension lap lengths (in)
+over every combination of bar size and the config.py cube_* axes (lambda_er = 1)
+with the vectorized engine, and writes them to cube_path as one .npy array with
+a .json sidecar holding the axes and a digest of the properties file.
+
+Serving workers memory-map the file read-only, so any number of processes
+share one copy through the page cache, and answer on-grid requests by index.
+"""
+import hashlib
+import json
+import logging
+import os
+from config import props_path, cube_path, cube_spacings, cube_covers, cube_f_c, cube_f_y, cube_densities
+from tables import load_props_table, load_props_digest
+from dev_lap import DevLapResult
+
+logger = logging.getLogger(__name__)
+
+def cube_axes(data_path=props_path):
+    """
+    Returns grid axes keyed like the /dev-lap request values, in array axis order.
+    """
+    return {
+        'size': list(load_props_table(data_path)),
+        'spacing': [float(x) for x in cube_spacings],
+        'cover': [float(x) for x in cube_covers],
+        'f_c': [float(x) for x in cube_f_c],
+        'f_y': [float(x) for x in cube_f_y],
+        'concDensity': [float(x) for x in cube_densities],
+        'epoxy_coat': [False, True],
+        'top_bar': [False, True]
+    }
+
+def file_digest(data_path):
+    with open(data_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def build_cube(path=cube_path, data_path=props_path):
+    """
+    Calculates the cube and writes it, replacing any previous file atomically.
+
+    Returns:
+    - Array shape, one axis per cube_axes key followed by (l_d, l_dh, ten_lap_len).
+    """
+    import numpy as np
+    from dev_lap_batch import calc_dev_lap_batch
+
+    axes = cube_axes(data_path)
+    grids = np.meshgrid(*[np.asarray(values) for values in axes.values()], indexing='ij')
+    size, spacing, cover, f_c, f_y, conc_density, epoxy_coat, top_bar = (grid.ravel() for grid in grids)
+    lengths = calc_dev_lap_batch(size, spacing, cover, f_c, f_y, conc_density, epoxy_coat, top_bar, data_path=data_path)
+    shape = grids[0].shape + (3,)
+    cube = np.stack([lengths['l_d'], lengths['l_dh'], lengths['ten_lap_len']], axis=-1).reshape(shape)
+
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, cube)
+    with open(path + '.json.tmp', 'w') as f:
+        json.dump({'axes': axes, 'props_digest': file_digest(data_path)}, f)
+    os.replace(path + '.tmp', path)
+    os.replace(path + '.json.tmp', path + '.json')
+    return shape
+
+class DevLapCube:
+    """
+    Read-only memory-mapped cube with a value to index map per axis.
+    """
+    def __init__(self, path, data_path=props_path):
+        import numpy as np
+
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        # checked against the loaded table, which may lag the file until it is reloaded
+        if meta['axes'] != cube_axes(data_path) or meta['props_digest'] != load_props_digest(data_path):
+            raise ValueError(f"Cube '{path}' is out of date, rebuild with python cube.py.")
+        self.lengths = np.load(path, mmap_mode='r')
+        self.index = [{value: i for i, value in enumerate(values)} for values in meta['axes'].values()]
+
+    def lookup(self, values):
+        """
+        Returns DevLapResult for extracted /dev-lap request values, None when off-grid.
+        """
+        if values['lambda_er'] != 1:
+            return None
+        key = (
+            values['size'],
+            values['spacing'],
+            values['cover'],
+            values['f_c'],
+            values['f_y'],
+            values['concDensity'],
+            values['epoxy_coat'] != 'no',
+            values['top_bar'] != 'no'
+        )
+        try:
+            index = tuple(axis_index[value] for axis_index, value in zip(self.index, key))
+        except (KeyError, TypeError):
+            return None
+        return DevLapResult(*self.lengths[index].tolist())
+
+def get_dev_lap_cube(path=cube_path, data_path=props_path):
+    """
+    Opens the memory-mapped cube, returning None when it has not been built or
+    does not match the loaded properties table.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return DevLapCube(path, data_path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning('Serving /dev-lap without cube: %s', e)
+        return None
+
+if __name__ == '__main__':
+    shape = build_cube()
+    print(f'{cube_path}: {shape}')
@@ -1,7 +1,8 @@
 import math
+from typing import NamedTuple
 from config import props_path
-from unit_conversion import return_ft_in
-from rebar import RebarProperties
+from unit_conversion import format_ft_in
+from tables import get_bar_props
 
 def calc_cb(bar_diameter: float, cover: float, spacing: float):
     """
@@ -76,7 +77,88 @@ def calc_l_db(bar_diameter, f_c, f_y):
 def calc_l_hdb(bar_diameter, f_c, f_y):
     return 38 * bar_diameter / 60 * (f_y / math.sqrt(f_c))
 
+def calc_l_dbc(bar_diameter, f_c, f_y):
+    """
+    Calculates basic compression development length (in).
+    """
+    return max(0.63 * bar_diameter * f_y / math.sqrt(f_c), 0.3 * bar_diameter * f_y)
+
+def calc_steel_area(bar_area, spacing, bar_bundle=1):
+    """
+    Calculates steel area per foot (in²/ft).
+
+    Parameters:
+    - bar_area: Area of rebar (in²).
+    - spacing: Center-to-center spacing of rebar (in).
+    - bar_bundle: Number of bars per bundle.
+    """
+    return round(bar_area * bar_bundle * 12 / spacing, 2)
+
+def calc_lambda_er(as_req, steel_area):
+    """
+    Calculates excess reinforcement factor from required steel area (in²/ft),
+    1 when no required area is given.
+    """
+    if as_req:
+        return as_req / steel_area
+    else:
+        return 1
+
+def calc_bundle_factor(bar_bundle):
+    """
+    Calculates lap splice factor for bundled bars.
+    """
+    if bar_bundle == 4:
+        return 1.33
+    elif bar_bundle == 3:
+        return 1.2
+    else:
+        return 1
+
+def calc_comp_lap(bar_diameter, f_y, m=1):
+    """
+    Calculates compression lap splice length (in).
+
+    Parameters:
+    - bar_diameter: Diameter of rebar (in).
+    - f_y: Yield strength of reinforcement (ksi).
+    - m: Compression lap modification factor.
+    """
+    if f_y <= 60:
+        return max(0.5 * m * f_y * bar_diameter, 12)
+    else:
+        return max(m * (0.9 * f_y - 24) * bar_diameter, 12)
+
+def format_dev_lap(l_d, l_dh, ten_lap_len):
+    """
+    Formats tension development, hook development and tension lap lengths (in)
+    as ft-in strings rounded up to the inch.
+    """
+    return {
+        'tension_development': format_ft_in(l_d / 12, multiple=1, direction='up'),
+        'tension_hook_development': format_ft_in(l_dh / 12, multiple=1, direction='up'),
+        'tension_splice': format_ft_in(ten_lap_len / 12, multiple=1, direction='up')
+    }
+
+def format_whole_in(length):
+    """
+    Formats length (in) as a ft-in string rounded up to the whole inch with
+    math.ceil, as classes.MainRebarProperties does.
+    """
+    feet, inches = divmod(math.ceil(length), 12)
+    return f'{feet}\'-{inches}"'
+
+class DevLapResult(NamedTuple):
+    """
+    Unformatted development and lap lengths (in).
+    """
+    l_d: float
+    l_dh: float
+    ten_lap_len: float
+
 class ConcreteBeam:
+    __slots__ = ('spacing', 'cover', 'f_c', 'f_y', 'conc_density', 'bar_diameter', 'bar_area')
+
     def __init__(self, bar_size: str, spacing: float, cover: float, f_c: float, f_y: float, conc_density: float):
         """
         Base class for concrete beam.
@@ -100,35 +182,33 @@ class ConcreteBeam:
         self.f_c = f_c
         self.f_y = f_y
         self.conc_density = conc_density
-        rebar = RebarProperties(bar_size, props_path)
-        self.bar_diameter = rebar.bar_diameter
-        self.bar_area = rebar.bar_area
+        bar = get_bar_props(bar_size, props_path)
+        self.bar_diameter = bar.bar_diameter
+        self.bar_area = bar.bar_area
 
 class RebarDevLap:
+    __slots__ = ('beam', 'epoxy_coat', 'top_bar', 'c_b', 'lambda_', 'lambda_er', 'l_d', 'l_dh', 'ten_lap_len')
 
     def __init__(self, beam_instance, epoxy_coat=False, top_bar=False, lambda_er=1):
-        self.bar_diameter = beam_instance.bar_diameter
-        self.f_c = beam_instance.f_c
-        self.f_y = beam_instance.f_y
-        self.spacing = beam_instance.spacing
-        self.cover = beam_instance.cover
+        self.beam = beam_instance
         self.epoxy_coat = epoxy_coat
         self.top_bar = top_bar
-        self.c_b = calc_cb(self.bar_diameter, self.cover, self.spacing)
+        self.c_b = calc_cb(beam_instance.bar_diameter, beam_instance.cover, beam_instance.spacing)
 
         self.lambda_ = calc_lambda(beam_instance.conc_density)
         self.lambda_er = lambda_er
 
     def calc_tension_dev_len(self):
-        l_db = calc_l_db(self.bar_diameter, self.f_c, self.f_y)
-        lambda_cf = calc_lambda_cf(self.bar_diameter, self.spacing, self.cover, self.epoxy_coat)
-        lambda_rl = calc_lambda_rl(self.top_bar, self.f_c)
-        lambda_rc = calc_lambda_rc(self.bar_diameter, self.c_b)
+        beam = self.beam
+        l_db = calc_l_db(beam.bar_diameter, beam.f_c, beam.f_y)
+        lambda_cf = calc_lambda_cf(beam.bar_diameter, beam.spacing, beam.cover, self.epoxy_coat)
+        lambda_rl = calc_lambda_rl(self.top_bar, beam.f_c)
+        lambda_rc = calc_lambda_rc(beam.bar_diameter, self.c_b)
         self.l_d = max(l_db * min(lambda_rl * lambda_cf, 1.7) * lambda_rc * self.lambda_er / self.lambda_, 12)
         return self.l_d
     
     def calc_hook_dev_len(self, lambda_rc=1):
-        l_hdb = calc_l_hdb(self.bar_diameter, self.f_c, self.f_y)
+        l_hdb = calc_l_hdb(self.beam.bar_diameter, self.beam.f_c, self.beam.f_y)
         lambda_cw = calc_lambda_cw(self.epoxy_coat)
         self.l_dh = l_hdb * (lambda_rc * lambda_cw * self.lambda_er / self.lambda_)
         return self.l_dh
@@ -140,14 +220,57 @@ class RebarDevLap:
             self.ten_lap_len = max(1.3 * self.l_d, 12)
         return self.ten_lap_len
 
+    def calc_dev_lap(self, lambda_rc=1, lap_class='B'):
+        """
+        Calculates tension development, hook development and tension lap lengths.
+        """
+        return DevLapResult(
+            self.calc_tension_dev_len(),
+            self.calc_hook_dev_len(lambda_rc),
+            self.calc_tension_lap_len(lap_class)
+            )
+
+    def print_dev_lap(self):
+        return format_dev_lap(self.l_d, self.l_dh, self.ten_lap_len)
+
+class MainRebarDevLap(RebarDevLap):
+    """
+    Development and lap lengths of main reinforcement, adding bundled bars,
+    excess reinforcement from required steel area and compression lengths.
+    """
+    __slots__ = ('bar_bundle', 'steel_area', 'l_dc', 'comp_lap_len')
+
+    def __init__(self, beam_instance, bar_bundle=1, as_req=0, epoxy_coat=False, top_bar=False):
+        self.bar_bundle = bar_bundle
+        self.steel_area = calc_steel_area(beam_instance.bar_area, beam_instance.spacing, bar_bundle)
+        lambda_er = calc_lambda_er(as_req, self.steel_area)
+        super().__init__(beam_instance, epoxy_coat, top_bar, lambda_er)
+
+    def calc_hook_dev_len(self, lambda_rc=1):
+        l_dh = super().calc_hook_dev_len(lambda_rc)
+        self.l_dh = max(l_dh, 8 * self.beam.bar_diameter, 6)
+        return self.l_dh
+
+    def calc_tension_lap_len(self, lap_class='B'):
+        self.ten_lap_len = super().calc_tension_lap_len(lap_class) * calc_bundle_factor(self.bar_bundle)
+        return self.ten_lap_len
+
+    def calc_comp_dev_len(self, lambda_rc=1):
+        l_dbc = calc_l_dbc(self.beam.bar_diameter, self.beam.f_c, self.beam.f_y)
+        self.l_dc = max(l_dbc * self.lambda_er * lambda_rc, 8)
+        return self.l_dc
+
+    def calc_comp_lap_len(self, m=1):
+        self.comp_lap_len = calc_comp_lap(self.beam.bar_diameter, self.beam.f_y, m) * calc_bundle_factor(self.bar_bundle)
+        return self.comp_lap_len
+
     def print_dev_lap(self):
-        tension_development = return_ft_in(self.l_d / 12, multiple=1, direction='up')[1]
-        tension_hook_development = return_ft_in(self.l_dh / 12, multiple=1, direction='up')[1]
-        tension_splice = return_ft_in(self.ten_lap_len / 12, multiple=1, direction='up')[1]
-
-        output = {
-            'tension_development': tension_development,
-            'tension_hook_development': tension_hook_development,
-            'tension_splice': tension_splice
+        # exact whole inches are kept, unlike format_dev_lap which /dev-lap keeps byte-compatible
+        return {
+            'tension_development': format_whole_in(self.l_d),
+            'tension_hook_development': format_whole_in(self.l_dh),
+            'tension_splice': format_whole_in(self.ten_lap_len),
+            'compression_development': format_whole_in(self.l_dc),
+            'compression_splice': format_whole_in(self.comp_lap_len),
+            'steel_area': self.steel_area
         }
-        return output
\ No newline at end of file
@@ -0,0 +1,129 @@
+import numpy as np
+from config import props_path
+from tables import get_bar_props
+
+# Vectorized counterparts of the dev_lap.py helpers. Operations are kept in the
+# same order as the scalar functions so results are bit-identical.
+
+def calc_bar_diameters(bar_size, data_path=props_path):
+    """
+    Maps bar size labels to rebar diameters (in).
+
+    Parameters:
+    - bar_size: Array of standard bar size labels (#).
+    - data_path: Path to rebar properties csv file.
+    """
+    sizes = np.asarray(bar_size, dtype=str)
+    labels, inverse = np.unique(sizes.ravel(), return_inverse=True)
+    diameters = np.array([get_bar_props(label, data_path).bar_diameter for label in labels], dtype=float)
+    return diameters[inverse].reshape(sizes.shape)
+
+def calc_cb(bar_diameter, cover, spacing):
+    return np.minimum(bar_diameter / 2 + cover, spacing / 2)
+
+def calc_lambda(conc_density):
+    return np.minimum(np.maximum(7.5 * conc_density / 1000, 0.75), 1)
+
+def calc_lambda_cf(bar_diameter, spacing, cover, epoxy_coat):
+    clear_spacing = spacing - bar_diameter
+    confined = (cover < 3 * bar_diameter) | (clear_spacing < 6 * bar_diameter)
+    return np.where(epoxy_coat, np.where(confined, 1.5, 1.2), 1.0)
+
+def calc_lambda_rc(bar_diameter, c_b):
+    return np.minimum(np.maximum(bar_diameter / c_b, 0.4), 1)
+
+def calc_lambda_rl(top_bar, f_c):
+    return np.where(top_bar | (f_c > 10), 1.3, 1.0)
+
+def calc_lambda_cw(epoxy_coat):
+    return np.where(epoxy_coat, 1.2, 1.0)
+
+def calc_l_db(bar_diameter, f_c, f_y):
+    return 2.4 * bar_diameter * f_y / np.sqrt(f_c)
+
+def calc_l_hdb(bar_diameter, f_c, f_y):
+    return 38 * bar_diameter / 60 * (f_y / np.sqrt(f_c))
+
+def calc_dev_lap_batch(bar_size, spacing, cover, f_c, f_y, conc_density,
+                       epoxy_coat=False, top_bar=False, lambda_er=1,
+                       lambda_rc=1, lap_class='B', data_path=props_path):
+    """
+    Calculates development and lap lengths (in) for arrays of cases.
+
+    Parameters follow ConcreteBeam and RebarDevLap, with each accepting an
+    array or a scalar broadcast across all cases:
+    - bar_size: Standard bar size label (#).
+    - spacing: Center-to-center spacing of rebar (in).
+    - cover: Distance from concrete face to edge of reinforcing bar (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of reinforcement (ksi).
+    - conc_density: Concrete density (pcf).
+    - epoxy_coat: Is rebar epoxy coated? (True/False).
+    - top_bar: Is rebar cast 12" above concrete below? (True/False).
+    - lambda_er: Excess reinforcement factor.
+    - lambda_rc: Confinement factor for hook development (scalar).
+    - lap_class: Tension lap splice class, 'A' or 'B' (scalar).
+
+    Returns:
+    - dict of arrays 'l_d', 'l_dh' and 'ten_lap_len' (in).
+    """
+    bar_diameter = calc_bar_diameters(bar_size, data_path)
+    bar_diameter, spacing, cover, f_c, f_y, conc_density, lambda_er = np.broadcast_arrays(
+        bar_diameter,
+        np.asarray(spacing, dtype=float),
+        np.asarray(cover, dtype=float),
+        np.asarray(f_c, dtype=float),
+        np.asarray(f_y, dtype=float),
+        np.asarray(conc_density, dtype=float),
+        np.asarray(lambda_er, dtype=float)
+        )
+    epoxy_coat = np.asarray(epoxy_coat, dtype=bool)
+    top_bar = np.asarray(top_bar, dtype=bool)
+
+    c_b = calc_cb(bar_diameter, cover, spacing)
+    lambda_ = calc_lambda(conc_density)
+
+    # tension development
+    l_db = calc_l_db(bar_diameter, f_c, f_y)
+    lambda_cf = calc_lambda_cf(bar_diameter, spacing, cover, epoxy_coat)
+    lambda_rl = calc_lambda_rl(top_bar, f_c)
+    l_d = np.maximum(l_db * np.minimum(lambda_rl * lambda_cf, 1.7) * calc_lambda_rc(bar_diameter, c_b) * lambda_er / lambda_, 12)
+
+    # hook development
+    l_hdb = calc_l_hdb(bar_diameter, f_c, f_y)
+    l_dh = l_hdb * (lambda_rc * calc_lambda_cw(epoxy_coat) * lambda_er / lambda_)
+
+    # tension lap
+    if lap_class == 'A':
+        ten_lap_len = np.maximum(l_d, 12)
+    else:
+        ten_lap_len = np.maximum(1.3 * l_d, 12)
+
+    return {'l_d': l_d, 'l_dh': l_dh, 'ten_lap_len': ten_lap_len}
+
+def calc_flag(column):
+    """
+    Converts a 'yes'/'no' selection column to booleans (boolean columns pass through).
+    """
+    column = np.asarray(column)
+    if column.dtype == bool:
+        return column
+    return column != 'no'
+
+def calc_dev_lap_cases(cases, data_path=props_path):
+    """
+    Calculates development and lap lengths (in) for columns keyed like the
+    /dev-lap request body (dict of arrays, DataFrame or structured array).
+    """
+    return calc_dev_lap_batch(
+        cases['size'],
+        cases['spacing'],
+        cases['cover'],
+        cases['f_c'],
+        cases['f_y'],
+        cases['concDensity'],
+        calc_flag(cases['epoxy_coat']),
+        calc_flag(cases['top_bar']),
+        cases['lambda_er'],
+        data_path=data_path
+        )
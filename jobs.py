@@ -0,0 +1,209 @@
+"""
+Batch job runner for full-project rebar schedules.
+
+    python jobs.py cases.csv results.csv --workers 8 --chunksize 1000
+    python jobs.py cases.parquet results.parquet
+
+Each input row is a case with the /props fields (size, type, bend) and,
+optionally, the /dev-lap fields (num_keys and select_keys from config.py),
+where a grade column may stand in for f_y.
+Rows are read as a stream, sharded across a process pool in chunks and
+written out in input order, so memory stays bounded by the chunks in flight.
+Per-case errors are reported in the error column. Parquet files need pyarrow.
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+from collections import deque
+from config import num_keys, select_keys
+from service import extract_data, with_grade, props_key, resolve_props, calc_dev_lap, case_errors
+
+# output columns appended to the input columns
+props_columns = [
+    'bar_diameter',
+    'bar_area',
+    'bar_weight',
+    'bar_perimeter',
+    'pin_diameter',
+    'bend_dimension',
+    'add_length'
+]
+dev_lap_columns = [
+    'tension_development',
+    'tension_hook_development',
+    'tension_splice'
+]
+output_columns = props_columns + dev_lap_columns + ['error']
+
+def calc_case(row):
+    """
+    Calculates rebar properties, bend dimensions and, when every num_keys field
+    (or grade for f_y) is given, development and lap lengths of one case.
+
+    Parameters:
+    - row: Case dict, e.g. a csv row. Empty values are treated as missing,
+      a missing bend as a straight bar.
+
+    Returns:
+    - row with output_columns added. Properties and lengths are calculated
+      independently; the error column joins the messages of whichever failed.
+    """
+    data = {key: value for key, value in row.items() if value not in ('', None)}
+    result = dict(row)
+    errors = []
+    try:
+        result.update(resolve_props(props_key({'bend': 'None', **data})))
+    except case_errors as e:
+        errors.append(str(e))
+    try:
+        data = with_grade(data)
+        if all(key in data for key in num_keys):
+            result.update(calc_dev_lap(extract_data(data, num_keys, select_keys)))
+    except case_errors as e:
+        if str(e) not in errors:
+            errors.append(str(e))
+    if errors:
+        result['error'] = '; '.join(errors)
+    return result
+
+def output_fieldnames(fieldnames):
+    """
+    Returns input fieldnames followed by output_columns not already present.
+    """
+    fieldnames = list(fieldnames or [])
+    return fieldnames + [name for name in output_columns if name not in fieldnames]
+
+def calc_chunk(rows):
+    return [calc_case(row) for row in rows]
+
+def iter_chunks(rows, chunksize):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def run_chunks(chunks, workers):
+    """
+    Calculates chunks of cases on a process pool, yielding results in input
+    order with at most two chunks per worker in flight.
+    """
+    if workers <= 1:
+        yield from map(calc_chunk, chunks)
+        return
+
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(calc_chunk, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+def is_parquet(path):
+    return path.endswith('.parquet')
+
+def read_csv(path, chunksize):
+    """
+    Yields (fieldnames, chunk of row dicts) from a csv file.
+    """
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        for chunk in iter_chunks(reader, chunksize):
+            yield reader.fieldnames, chunk
+
+def read_parquet(path, chunksize):
+    """
+    Yields (fieldnames, chunk of row dicts) from a parquet file, one record batch at a time.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunksize):
+        yield batch.schema.names, batch.to_pylist()
+
+class CsvWriter:
+    def __init__(self, path, fieldnames):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """
+    Writes chunks of rows as parquet row groups, with every column as strings.
+    """
+    def __init__(self, path, fieldnames):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.fieldnames = fieldnames
+        self.schema = pa.schema([(name, pa.string()) for name in fieldnames])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        columns = [
+            self.pa.array([None if row.get(name) is None else str(row[name]) for row in rows], self.pa.string())
+            for name in self.fieldnames
+        ]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def run_job(input_path, output_path, workers=1, chunksize=1000):
+    """
+    Calculates every case of an input csv/parquet file into an output csv/parquet file.
+
+    Parameters:
+    - input_path: Path to cases file.
+    - output_path: Path to results file, input columns followed by output_columns.
+    - workers: Number of worker processes.
+    - chunksize: Number of cases per work unit.
+
+    Returns:
+    - Number of cases calculated.
+    """
+    read = read_parquet if is_parquet(input_path) else read_csv
+    chunks = read(input_path, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        fieldnames = output_fieldnames([])
+    else:
+        fieldnames = output_fieldnames(first[0])
+        chunks = itertools.chain([first], chunks)
+
+    writer = (ParquetWriter if is_parquet(output_path) else CsvWriter)(output_path, fieldnames)
+    count = 0
+    try:
+        for results in run_chunks((chunk for _, chunk in chunks), workers):
+            writer.write(results)
+            count += len(results)
+    finally:
+        writer.close()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Calculate a file of rebar cases.')
+    parser.add_argument('input', help='cases file (.csv or .parquet)')
+    parser.add_argument('output', help='results file (.csv or .parquet)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--chunksize', type=int, default=1000, help='cases per work unit')
+    args = parser.parse_args()
+
+    count = run_job(args.input, args.output, args.workers, args.chunksize)
+    print(f'{count} cases written to {args.output}', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
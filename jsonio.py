@@ -0,0 +1,54 @@
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library encoder is used instead
+    orjson = None
+
+# Compact JSON encoding with sorted keys, byte-compatible with json.dumps(obj,
+# sort_keys=True, separators=(',', ':')) (and so with Flask's jsonify outside
+# debug mode), using orjson when it is installed.
+
+if orjson is not None:
+    orjson_options = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+# orjson output that may differ from the standard library: exponent and small
+# float formatting, NaN/Infinity (written as null), and non-ASCII characters and
+# DEL (escaped as \u007f by the standard library, written raw by orjson)
+float_format_re = re.compile(rb'\de|0\.0000')
+
+def std_dumps(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()
+
+def dumps(obj):
+    """
+    Serializes obj to compact JSON with sorted keys (bytes).
+    """
+    if orjson is None:
+        return std_dumps(obj)
+    try:
+        body = orjson.dumps(obj, option=orjson_options)
+    except TypeError:
+        # non-str keys, integers over 64 bits or types left to the standard library
+        return std_dumps(obj)
+    if b'null' in body or not body.isascii() or b'\x7f' in body or float_format_re.search(body):
+        return std_dumps(obj)
+    return body
+
+def loads(data):
+    """
+    Parses JSON document (bytes or str), accepting everything json.loads does.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN literals or out-of-range integers, reported by the standard library
+            pass
+    return json.loads(data)
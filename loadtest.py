@@ -0,0 +1,289 @@
+"""
+Load test of the HTTP service.
+
+    python loadtest.py -o load.json
+    python loadtest.py --server "uvicorn asgi:app --port {port} --workers 4" --concurrency 32
+    python loadtest.py --url http://127.0.0.1:5000 --mix props=1,dev_lap=1 --requests 20000
+
+Starts the server command (default: app.py on Flask's server, without debug),
+waits until it accepts connections, then replays a seeded mix of /props and
+/dev-lap payloads, including invalid sizes and bends, from --concurrency
+keep-alive connections. Throughput, latency percentiles, status counts and
+error rates (overall and per payload kind) are reported as JSON, so serving
+modes and worker counts can be compared on the same machine.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+from bench import git_commit
+
+main_sizes = ['#3', '#4', '#5', '#6', '#7', '#8', '#9', '#10', '#11', '#14', '#18']
+stirrup_sizes = ['#3', '#4', '#5', '#6', '#7', '#8']
+
+def props_payload(rng):
+    if rng.random() < 0.5:
+        body = {'type': 'main', 'size': rng.choice(main_sizes), 'bend': rng.choice(['None', '90', '180'])}
+    else:
+        body = {'type': 'stirrup', 'size': rng.choice(stirrup_sizes), 'bend': rng.choice(['None', '90', '135', '180'])}
+    return 'POST', '/props', body
+
+def props_invalid_payload(rng):
+    # unknown size, or a bend that is not a standard hook (ValueError)
+    if rng.random() < 0.5:
+        body = {'type': 'main', 'size': rng.choice(['#2', '#12', '#20']), 'bend': 'None'}
+    else:
+        body = {'type': 'main', 'size': rng.choice(main_sizes), 'bend': rng.choice(['45', '135'])}
+    return 'POST', '/props', body
+
+def dev_lap_body(rng, size):
+    return {
+        'size': size,
+        'spacing': rng.choice([4, 6, 8, 10, 12, 18]),
+        'cover': rng.choice([1.5, 2, 3]),
+        'f_c': rng.choice([3, 4, 5, 6, 8]),
+        'f_y': rng.choice([60, 80]),
+        'concDensity': rng.choice([110, 150]),
+        'lambda_er': 1,
+        'epoxy_coat': rng.choice(['no', 'yes']),
+        'top_bar': rng.choice(['no', 'yes'])
+    }
+
+def dev_lap_payload(rng):
+    return 'POST', '/dev-lap', dev_lap_body(rng, rng.choice(main_sizes))
+
+def dev_lap_invalid_payload(rng):
+    return 'POST', '/dev-lap', dev_lap_body(rng, rng.choice(['#2', '#12', '#20']))
+
+def props_get_payload(rng):
+    _, path, body = props_payload(rng)
+    return 'GET', path, body
+
+def dev_lap_get_payload(rng):
+    _, path, body = dev_lap_payload(rng)
+    return 'GET', path, body
+
+# kind: (payload factory, default weight)
+payload_kinds = {
+    'props': (props_payload, 4),
+    'props_invalid': (props_invalid_payload, 1),
+    'dev_lap': (dev_lap_payload, 4),
+    'dev_lap_invalid': (dev_lap_invalid_payload, 1),
+    'props_get': (props_get_payload, 0),
+    'dev_lap_get': (dev_lap_get_payload, 0),
+}
+
+def parse_mix(mix):
+    """
+    Parses 'kind=weight,...' into weights of every payload kind (unlisted kinds get 0).
+    """
+    if not mix:
+        return {kind: weight for kind, (_, weight) in payload_kinds.items()}
+    weights = dict.fromkeys(payload_kinds, 0)
+    for item in mix.split(','):
+        kind, _, weight = item.partition('=')
+        if kind not in payload_kinds:
+            raise ValueError(f"Unknown payload kind '{kind}', expected one of {', '.join(payload_kinds)}.")
+        weights[kind] = float(weight or 1)
+    return weights
+
+def make_payloads(weights, count, seed):
+    """
+    Returns count (kind, method, path, body bytes) requests drawn from the mix.
+    """
+    rng = random.Random(seed)
+    kinds = [kind for kind, weight in weights.items() if weight > 0]
+    payloads = []
+    for kind in rng.choices(kinds, [weights[kind] for kind in kinds], k=count):
+        method, path, body = payload_kinds[kind][0](rng)
+        if method == 'GET':
+            payloads.append((kind, method, f'{path}?{urlencode(body)}', None))
+        else:
+            payloads.append((kind, method, path, json.dumps(body).encode()))
+    return payloads
+
+def percentile(sorted_values, q):
+    """
+    Nearest-rank percentile of sorted values, None when empty.
+    """
+    if not sorted_values:
+        return None
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+def summarize(samples, seconds):
+    """
+    Returns request count, throughput, latency (ms) and status summary of (latency_s, status) samples.
+    """
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for _, status in samples if not (isinstance(status, int) and status < 400))
+    return {
+        'requests': len(samples),
+        'throughput_rps': len(samples) / seconds if seconds else None,
+        'latency_ms': {
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None,
+            'mean': sum(latencies) / len(latencies) if latencies else None
+        },
+        'statuses': statuses,
+        'error_rate': errors / len(samples) if samples else None
+    }
+
+class Worker(threading.Thread):
+    """
+    Sends requests over one keep-alive connection, recording (kind, latency_s, status).
+    Connection failures are recorded with status 'connection_error'.
+    """
+    def __init__(self, host, port, payloads, deadline, max_requests, counter):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.payloads = payloads
+        self.deadline = deadline
+        self.max_requests = max_requests
+        self.counter = counter
+        self.samples = []
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {'Content-Type': 'application/json'}
+        while time.perf_counter() < self.deadline:
+            index = next(self.counter)
+            if self.max_requests and index >= self.max_requests:
+                break
+            kind, method, path, body = self.payloads[index % len(self.payloads)]
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                status = 'connection_error'
+            self.samples.append((kind, time.perf_counter() - start, status))
+        conn.close()
+
+def run_load(host, port, payloads, concurrency, duration, max_requests=0):
+    """
+    Replays payloads from concurrency connections for duration seconds (or
+    until max_requests are sent) and returns (samples, elapsed seconds).
+    """
+    counter = itertools.count()  # next() is atomic under the GIL
+    start = time.perf_counter()
+    deadline = start + duration if duration else float('inf')
+    workers = [Worker(host, port, payloads, deadline, max_requests, counter) for _ in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return [sample for worker in workers for sample in worker.samples], elapsed
+
+def start_server(command, port, timeout):
+    """
+    Starts server command in its own process group and waits until the port accepts connections.
+    """
+    process = subprocess.Popen(
+        shlex.split(command.format(port=port, python=sys.executable)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}: {command}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError(f'Server did not accept connections within {timeout} s: {command}')
+
+def stop_server(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=10)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='write JSON report to file (default: stdout)')
+    parser.add_argument('--server', default='{python} -m flask --app app run --port {port}',
+                        help='server command, formatted with {port} and {python}')
+    parser.add_argument('--port', type=int, default=5051, help='port the server command listens on')
+    parser.add_argument('--url', help='load an already running server instead of starting one')
+    parser.add_argument('--startup-timeout', type=float, default=30, help='seconds to wait for the server')
+    parser.add_argument('--mix', default='', help=f"payload weights, e.g. props=4,dev_lap=4,props_invalid=1 (kinds: {', '.join(payload_kinds)})")
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent keep-alive connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of measured load')
+    parser.add_argument('--requests', type=int, default=0, help='stop after this many requests (0: duration only)')
+    parser.add_argument('--warmup', type=float, default=1, help='seconds of unmeasured load first')
+    parser.add_argument('--payloads', type=int, default=2000, help='distinct payloads generated and cycled')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the payload mix')
+    args = parser.parse_args(argv)
+
+    payloads = make_payloads(parse_mix(args.mix), args.payloads, args.seed)
+    if args.url:
+        url = urlsplit(args.url)
+        host, port, process = url.hostname, url.port or 80, None
+    else:
+        host, port = '127.0.0.1', args.port
+        process = start_server(args.server, port, args.startup_timeout)
+
+    try:
+        if args.warmup:
+            run_load(host, port, payloads, args.concurrency, args.warmup)
+        samples, elapsed = run_load(host, port, payloads, args.concurrency, 0 if args.requests else args.duration, args.requests)
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'server': args.url or args.server.format(port=port, python=sys.executable),
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'duration_s': elapsed,
+        **summarize([(latency, status) for _, latency, status in samples], elapsed),
+        'kinds': {
+            kind: summarize([(latency, status) for k, latency, status in samples if k == kind], elapsed)
+            for kind in payload_kinds if any(k == kind for k, _, _ in samples)
+        }
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
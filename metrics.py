@@ -0,0 +1,167 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from config import profile_enabled, profile_sample_rate, slow_request_seconds, profile_dir
+
+# Opt-in (REBAR_PROFILE=1) per-stage and per-request timing histograms, rendered
+# in Prometheus text format, plus sampled cProfile dumps of slow requests.
+# When disabled, stage() and request_timer() return a shared no-op context and
+# timed() leaves views unwrapped.
+
+# histogram bucket upper bounds (s)
+buckets = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram of durations (s).
+    """
+    def __init__(self):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect_left(buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def render(self, name, labels):
+        """
+        Returns Prometheus text lines for this histogram.
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {total}')
+        lines.append(f'{name}_count{{{labels}}} {count}')
+        return lines
+
+class StageTimer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+stage_histograms = {}
+request_histograms = {}
+_registry_lock = threading.Lock()
+# only one sampled profile at a time (cProfile cannot nest across threads)
+_profile_lock = threading.Lock()
+null_stage = nullcontext()
+
+def get_histogram(histograms, name):
+    histogram = histograms.get(name)
+    if histogram is None:
+        with _registry_lock:
+            histogram = histograms.setdefault(name, Histogram())
+    return histogram
+
+def stage(name):
+    """
+    Returns context manager timing a request stage, e.g. with stage('serialize'): ...
+    """
+    if not profile_enabled:
+        return null_stage
+    return StageTimer(get_histogram(stage_histograms, name))
+
+def dump_profile(profiler, endpoint, seconds):
+    os.makedirs(profile_dir, exist_ok=True)
+    filename = f'{endpoint}-{time.time_ns()}-{seconds * 1000:.0f}ms.prof'
+    profiler.dump_stats(os.path.join(profile_dir, filename))
+
+class RequestTimer:
+    """
+    Context manager recording the duration of one request, attaching a sampled
+    cProfile dump when it is slower than slow_request_seconds. Also usable
+    around awaits, where the profile includes other requests on the event loop.
+    """
+    __slots__ = ('endpoint', 'histogram', 'profiler', 'start')
+
+    def __init__(self, endpoint, histogram):
+        self.endpoint = endpoint
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.profiler = None
+        if random.random() < profile_sample_rate and _profile_lock.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.histogram.observe(seconds)
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profile_lock.release()
+            if seconds > slow_request_seconds:
+                dump_profile(self.profiler, self.endpoint, seconds)
+
+def request_timer(endpoint):
+    """
+    Returns context manager timing one request of an endpoint, e.g. a streamed
+    response generator or an ASGI route.
+    """
+    if not profile_enabled:
+        return null_stage
+    return RequestTimer(endpoint, get_histogram(request_histograms, endpoint))
+
+def timed(endpoint):
+    """
+    Decorator recording request duration of a view, attaching a sampled
+    cProfile dump when the request is slower than slow_request_seconds.
+    """
+    def decorator(view):
+        if not profile_enabled:
+            return view
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with request_timer(endpoint):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def render(samples=()):
+    """
+    Returns all histograms in Prometheus text format.
+
+    Parameters:
+    - samples: Additional (name, type, value) metrics, e.g. cache counters.
+    """
+    lines = [
+        '# HELP rebar_stage_seconds Time spent in each request stage.',
+        '# TYPE rebar_stage_seconds histogram'
+    ]
+    for name, histogram in sorted(stage_histograms.items()):
+        lines += histogram.render('rebar_stage_seconds', f'stage="{name}"')
+    lines += [
+        '# HELP rebar_request_seconds Time spent handling each endpoint.',
+        '# TYPE rebar_request_seconds histogram'
+    ]
+    for name, histogram in sorted(request_histograms.items()):
+        lines += histogram.render('rebar_request_seconds', f'endpoint="{name}"')
+    for name, metric_type, value in samples:
+        lines += [f'# TYPE {name} {metric_type}', f'{name} {value}']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,81 @@
+from types import MappingProxyType
+from typing import NamedTuple
+from rebar import RebarProperties, RebarBend
+from tables import load_props_table
+
+# standard hook angles (degrees)
+bend_angles = (90, 135, 180)
+
+class PropsEntry(NamedTuple):
+    """
+    Precomputed /props result for one (bar_size, stirrup, bar_bend) combination.
+
+    Attributes:
+    - result: Output dict, or None for invalid combinations.
+    - body: Serialized result (bytes), or None for invalid combinations.
+    - error: ValueError message for invalid combinations, otherwise None.
+    """
+    result: dict
+    body: bytes
+    error: str
+
+def calc_props(bar_size: str, data_path: str, stirrup=False, bar_bend=None):
+    """
+    Calculates rebar properties and bend dimensions (in).
+
+    Parameters:
+    - bar_size: Standard bar size label (#).
+    - data_path: Path to rebar properties csv file.
+    - stirrup: Is rebar a stirrup? (True/False).
+    - bar_bend: Angle of bend (degrees), None for straight bar.
+    """
+    rebar = RebarProperties(bar_size, data_path, stirrup)
+    if bar_bend is not None:
+        bend = RebarBend(rebar, bar_bend)
+        bend.set_bend_extension()
+        bend_dimension = bend.calc_bend_dimension()
+        add_length = bend.calc_add_length()
+    else:
+        bend_dimension = ''
+        add_length = ''
+
+    return {
+        'bar_diameter': rebar.bar_diameter,
+        'bar_area': rebar.bar_area,
+        'bar_weight': rebar.bar_weight,
+        'bar_perimeter': rebar.bar_perimeter,
+        'pin_diameter': rebar.pin_diameter,
+        'bend_dimension': bend_dimension,
+        'add_length': add_length
+    }
+
+def build_props_table(data_path: str, serialize):
+    """
+    Precomputes every bar size, stirrup and bend combination.
+
+    Parameters:
+    - data_path: Path to rebar properties csv file.
+    - serialize: Function returning response bytes for a result dict.
+
+    Returns:
+    - Read-only mapping of (bar_size, stirrup, bar_bend) to PropsEntry.
+    """
+    table = {}
+    for bar_size in load_props_table(data_path):
+        for stirrup in (False, True):
+            for bar_bend in (None,) + bend_angles:
+                try:
+                    result = calc_props(bar_size, data_path, stirrup, bar_bend)
+                except ValueError as e:
+                    table[(bar_size, stirrup, bar_bend)] = PropsEntry(None, None, str(e))
+                else:
+                    table[(bar_size, stirrup, bar_bend)] = PropsEntry(result, serialize(result), None)
+    return MappingProxyType(table)
+
+def parse_bend(bar_bend):
+    """
+    Converts bend request value to angle (degrees), None for straight bar.
+    """
+    if bar_bend == 'None':
+        return None
+    return int(bar_bend)
@@ -1,5 +1,5 @@
-import pandas as pd
 import math
+from tables import get_bar_props
 
 def calc_arc_len(pin_diameter, bar_diameter, bar_bend):
     """
@@ -22,36 +22,48 @@ def calc_tangent_len(pin_diameter, bar_diameter):
     """
     return pin_diameter / 2 + bar_diameter
 
+def calc_b_dim(bar_diameter, pin_diameter, bar_bend):
+    """
+    Calculates B detailing dimension of hook (in), None where not applicable.
+
+    Parameters:
+    - bar_diameter: rebar diameter (in).
+    - pin_diameter: bend diameter of rebar (in).
+    - bar_bend: angle of bend (degrees).
+    """
+    if bar_bend == 180:
+        return max(4 * bar_diameter + 0.5 * pin_diameter + bar_diameter, 2.5)
+    elif bar_bend == 135:
+        return max(6 * bar_diameter + 0.5 * pin_diameter + bar_diameter, 2.5)
+    else:
+        return None
+
 class RebarProperties:
     """
     Class to retrieve steel rebar properties.
     """
+    __slots__ = ('stirrup', 'bar_size', 'properties')
+
     def __init__(self, bar_size: str, data_path: str, stirrup=False):
         self.stirrup = stirrup
         self.bar_size = bar_size
-        bar_props_df = pd.read_csv(data_path, dtype=str)
-        prop_table = bar_props_df[bar_props_df['bar_size'] == bar_size]
-
-        if prop_table.empty:
-            raise ValueError(f"Bar size '{bar_size}' not found in the properties file.")
-
-        self.properties = prop_table.iloc[0].to_dict()
+        self.properties = get_bar_props(bar_size, data_path)
 
     @property
     def bar_diameter(self):
-        return float(self.properties['bar_diameter'])
+        return self.properties.bar_diameter
 
     @property
     def bar_area(self):
-        return float(self.properties['bar_area'])
+        return self.properties.bar_area
 
     @property
     def bar_weight(self):
-        return float(self.properties['bar_weight'])
+        return self.properties.bar_weight
 
     @property
     def bar_perimeter(self):
-        return float(self.properties['bar_perimeter'])
+        return self.properties.bar_perimeter
 
     @property
     def pin_diameter(self):
@@ -76,6 +88,9 @@ class RebarBend:
     """
     Rebar subclass to calculate rebar bend dimensions.
     """
+    __slots__ = ('stirrup', 'bar_size', 'bar_diameter', 'pin_diameter', 'bar_bend',
+                 'bend_extension', 'bend_dimension', 'add_length')
+
     def __init__(self, rebar_instance, bar_bend):
         self.stirrup = rebar_instance.stirrup
         self.bar_size = rebar_instance.bar_size
@@ -0,0 +1,440 @@
+import glob
+import hashlib
+import os
+from config import num_keys, select_keys, main_num_keys, main_select_keys
+from config import props_path, bends_main_path, bends_other_path, grade_path, sweep_spacings
+from config import dev_lap_cache_size, dev_lap_cache_ttl, table_reload_interval
+from dev_lap import ConcreteBeam, RebarDevLap, MainRebarDevLap, format_dev_lap
+from tables import load_props_table, load_bends_table, load_grade_table, get_bar_props, get_bend_dims, get_grade_props
+from tables import reload_listeners, watch_tables, data_version
+from rebar import calc_b_dim
+from props_table import build_props_table, calc_props, parse_bend
+from cache import ResponseCache
+from cube import get_dev_lap_cube
+from unit_conversion import parse_feet
+from metrics import stage, render
+from jsonio import dumps, loads
+
+# Request handling shared by the Flask (app.py) and ASGI (asgi.py) entry points.
+# Handlers take parsed JSON request bodies and return serialized response bytes.
+
+def dump_response(obj):
+    """
+    Serializes response body (bytes), matching Flask's jsonify output.
+    """
+    return dumps(obj) + b'\n'
+
+def dump_line(obj):
+    """
+    Serializes one NDJSON line (bytes), in the compact format of response bodies.
+    """
+    return dumps(obj) + b'\n'
+
+# load data tables once at startup
+load_props_table(props_path)
+load_bends_table(bends_main_path)
+load_bends_table(bends_other_path)
+load_grade_table(grade_path)
+# (data version, value) of results derived from the data tables; rebuilt on
+# first use after a reload, labeled with the version read before building so a
+# value built during a swap is never taken for the newer version
+props_table_cache = (None, None)
+dev_lap_cube_cache = (None, None)
+# serialized /dev-lap responses keyed on data version and extracted request values
+dev_lap_cache = ResponseCache(dev_lap_cache_size, dev_lap_cache_ttl)
+
+def get_props_table():
+    """
+    Returns precomputed /props responses for every size, stirrup and bend
+    combination of the current data version.
+    """
+    global props_table_cache
+    version, table = props_table_cache
+    if version != data_version():
+        version = data_version()
+        table = build_props_table(props_path, dump_response)
+        props_table_cache = (version, table)
+    return table
+
+def get_cube():
+    """
+    Returns memory-mapped /dev-lap cube matching the current data version, None when unavailable.
+    """
+    global dev_lap_cube_cache
+    version, cube = dev_lap_cube_cache
+    if version != data_version():
+        version = data_version()
+        cube = get_dev_lap_cube()
+        dev_lap_cube_cache = (version, cube)
+    return cube
+
+def invalidate_derived():
+    """
+    Rebuilds the /props table and drops cached results after a data table reload.
+    """
+    get_props_table()
+    dev_lap_cache.clear()
+
+get_props_table()
+
+reload_listeners.append(invalidate_derived)
+
+def watch_data_tables():
+    """
+    Starts reloading changed data tables every table_reload_interval (s). Called
+    by the server entry points, so batch jobs and their pool workers never poll.
+
+    Returns:
+    - threading.Event stopping the watcher when set, None when reloading is disabled.
+    """
+    if table_reload_interval:
+        return watch_tables(table_reload_interval)
+    return None
+
+# errors reported inline for a single case of a batch request
+case_errors = (ValueError, TypeError, AttributeError, ArithmeticError)
+
+def extract_data(data, float_keys, str_keys):
+    extracted_data = {}
+    for key in float_keys:
+        extracted_data[key] = float(data.get(key, 0))
+    for key in str_keys:
+        extracted_data[key] = data.get(key, '')
+    return extracted_data
+
+def with_grade(data):
+    """
+    Returns request body with f_y (ksi) resolved from its grade designation,
+    e.g. 'A615, Grade 60', which takes precedence over a given f_y.
+    Unchanged when no grade is given.
+    """
+    grade = data.get('grade')
+    if not grade:
+        return data
+    return {**data, 'f_y': get_grade_props(grade, grade_path).f_y}
+
+def source_digest():
+    """
+    Returns digest of the service's Python sources, so a deploy that changes
+    response output also changes every entity tag.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+code_version = source_digest()
+
+def make_etag(key):
+    """
+    Returns strong entity tag (unquoted) of a response identified by its canonical
+    request key, e.g. the endpoint and normalized input values, the code version
+    and the data version.
+    """
+    return hashlib.sha256(repr((code_version, data_version()) + key).encode()).hexdigest()[:32]
+
+def props_key(data):
+    """
+    Returns normalized (bar_size, stirrup, bar_bend) key of a /props request body.
+    """
+    return (data.get('size'), data.get('type') == 'stirrup', parse_bend(data.get('bend')))
+
+def resolve_props(key):
+    """
+    Returns /props result for key, calculating combinations outside of the precomputed table.
+    """
+    entry = get_props_table().get(key)
+    if entry is None:
+        return calc_props(key[0], props_path, key[1], key[2])
+    if entry.error is not None:
+        raise ValueError(entry.error)
+    return entry.result
+
+def props_body(data):
+    """
+    Returns /props response body, served from the precomputed table when possible.
+    """
+    with stage('props_lookup'):
+        key = props_key(data)
+        entry = get_props_table().get(key)
+        if entry is not None and entry.error is None:
+            return entry.body
+        result = resolve_props(key)
+    with stage('serialize'):
+        return dump_response(result)
+
+def props_etag(data):
+    return make_etag(('props',) + props_key(data))
+
+def props_batch_body(bars):
+    """
+    Returns /props/batch response body for a list of /props request bodies.
+    Each unique combination is resolved once; errors are reported per bar.
+    Precomputed results are joined from their serialized bodies.
+    """
+    # serialized result per key, without the trailing newline
+    resolved = {}
+    results = []
+    table = get_props_table()
+    for data in bars:
+        try:
+            key = props_key(data)
+            if key not in resolved:
+                entry = table.get(key)
+                if entry is not None and entry.error is None:
+                    resolved[key] = entry.body[:-1]
+                else:
+                    try:
+                        resolved[key] = dumps(resolve_props(key))
+                    except (ValueError, TypeError) as e:
+                        resolved[key] = dumps({'error': str(e)})
+            results.append(resolved[key])
+        except case_errors as e:
+            results.append(dumps({'error': str(e)}))
+    return b'[' + b','.join(results) + b']\n'
+
+def calc_dev_lap(values):
+    """
+    Calculates formatted development and lap lengths from extracted request values,
+    read from the precomputed cube when it is built and the values are on its grid.
+    """
+    cube = get_cube()
+    if cube is not None:
+        with stage('cube_lookup'):
+            result = cube.lookup(values)
+        if result is not None:
+            with stage('format'):
+                return format_dev_lap(*result)
+
+    with stage('props_lookup'):
+        beam = ConcreteBeam(
+            values['size'],
+            values['spacing'],
+            values['cover'],
+            values['f_c'],
+            values['f_y'],
+            values['concDensity']
+            )
+
+    # development and lap
+    with stage('factors'):
+        epoxy_coat = values['epoxy_coat'] != 'no'
+        top_bar = values['top_bar'] != 'no'
+        rebar = RebarDevLap(
+            beam,
+            epoxy_coat,
+            top_bar,
+            values['lambda_er']
+            )
+        result = rebar.calc_dev_lap()
+    with stage('format'):
+        return format_dev_lap(*result)
+
+def dev_lap_body(data):
+    """
+    Returns /dev-lap response body, cached on the data version and extracted request values.
+    """
+    with stage('extract_data'):
+        values = extract_data(data, num_keys, select_keys)
+        version = data_version()
+        key = (version,) + tuple(values.values())
+
+    body = dev_lap_cache.get(key)
+    if body is None:
+        result = calc_dev_lap(values)
+        with stage('serialize'):
+            body = dump_response(result)
+        # not cached when the tables were reloaded while calculating
+        if data_version() == version:
+            dev_lap_cache.put(key, body)
+    return body
+
+def dev_lap_etag(data):
+    values = extract_data(data, num_keys, select_keys)
+    return make_etag(('dev-lap',) + tuple(values.values()))
+
+def calc_main_dev_lap(values):
+    """
+    Calculates formatted tension, hook and compression development and lap
+    lengths of main reinforcement from extracted request values.
+    """
+    if values['spacing'] <= 0 or values['f_c'] <= 0:
+        raise ValueError('spacing and f_c must be positive.')
+    beam = ConcreteBeam(
+        values['size'],
+        values['spacing'],
+        values['cover'],
+        values['f_c'],
+        values['f_y'],
+        values['concDensity']
+        )
+
+    # unset inputs default to a single bar, class B lap and unmodified factors
+    lambda_rc = values['lambda_rc'] or 1
+    rebar = MainRebarDevLap(
+        beam,
+        int(values['bundle'] or 1),
+        values['As_req'],
+        values['epoxy_coat'] != 'no',
+        values['top_bar'] != 'no'
+        )
+    rebar.calc_tension_dev_len()
+    rebar.calc_hook_dev_len(lambda_rc)
+    rebar.calc_tension_lap_len(values['lap_class'] or 'B')
+    rebar.calc_comp_dev_len(lambda_rc)
+    rebar.calc_comp_lap_len(values['m'] or 1)
+    return rebar.print_dev_lap()
+
+def main_dev_lap_body(data):
+    """
+    Returns /dev-lap/main response body, cached on the data version and extracted request values.
+    """
+    values = extract_data(data, num_keys + main_num_keys, select_keys + main_select_keys)
+    version = data_version()
+    key = ('main', version) + tuple(values.values())
+
+    body = dev_lap_cache.get(key)
+    if body is None:
+        body = dump_response(calc_main_dev_lap(values))
+        if data_version() == version:
+            dev_lap_cache.put(key, body)
+    return body
+
+def dev_lap_batch_line(index, data):
+    """
+    Returns NDJSON result line for one /dev-lap/batch case.
+
+    Parameters:
+    - index: Position of case in the batch.
+    - data: Request body dict, or an unparsed NDJSON line (bytes/str).
+    """
+    try:
+        if isinstance(data, (bytes, str)):
+            data = loads(data)
+        values = extract_data(with_grade(data), num_keys, select_keys)
+        result = calc_dev_lap(values)
+    except case_errors as e:
+        result = {'error': str(e)}
+    return dump_line({'index': index, **result})
+
+def length_in(value):
+    """
+    Converts request length to inches, given in inches or as a dimension string, e.g. "12'-6".
+    """
+    if isinstance(value, str):
+        return parse_feet(value) * 12
+    return float(value)
+
+def sweep_body(data):
+    """
+    Returns /dev-lap/sweep response body: the Pareto set of bar size and spacing
+    designs with the least steel area per foot and shortest length, fitting
+    within max_length (in, or a dimension string) with at least min_steel_area.
+    """
+    from sweep import calc_sweep  # imports numpy, loaded on first sweep
+
+    values = extract_data(with_grade(data), num_keys, select_keys)
+
+    results = calc_sweep(
+        values['cover'],
+        values['f_c'],
+        values['f_y'],
+        values['concDensity'],
+        length_in(data.get('max_length')),
+        data.get('length', 'tension_splice'),
+        values['epoxy_coat'] != 'no',
+        values['top_bar'] != 'no',
+        values['lambda_er'],
+        data.get('sizes'),
+        data.get('spacings', sweep_spacings),
+        float(data.get('min_steel_area', 0))
+        )
+    return dump_response(results)
+
+def takeoff_body(items):
+    """
+    Returns /takeoff response body: count, developed length (ft) and weight (lb)
+    totals per bar size of a schedule of bar marks, each with a size, count,
+    straight length (in, or a dimension string), type and list of hook bends
+    ('None' for a straight end adds no length).
+    """
+    from takeoff import calc_takeoff  # imports numpy, loaded on first takeoff
+
+    # hook add lengths per (bar_size, stirrup, bar_bend), as reported by /props
+    add_lengths = {}
+    bar_size, count, length, add_length = [], [], [], []
+    for index, item in enumerate(items):
+        try:
+            stirrup = item.get('type') == 'stirrup'
+            hooks = 0
+            for bend in item.get('bends') or []:
+                key = (item.get('size'), stirrup, parse_bend(bend))
+                if key[2] is None:
+                    # straight end, no added length
+                    continue
+                if key not in add_lengths:
+                    add_lengths[key] = resolve_props(key)['add_length']
+                hooks += add_lengths[key]
+            bar_size.append(str(item.get('size')))
+            count.append(int(item.get('count', 1)))
+            length.append(length_in(item.get('length', 0)))
+            add_length.append(hooks)
+        except case_errors as e:
+            raise ValueError(f'Item {index}: {e}') from None
+
+    return dump_response(calc_takeoff(bar_size, count, length, add_length))
+
+def bend_dims_body(data):
+    """
+    Returns /bend-dims response body: D, A, B and C detailing dimensions (in)
+    of a standard hook, None where not applicable.
+    """
+    bar_size = data.get('size')
+    bar_bend = str(data.get('bend'))
+    bends_path = bends_other_path if data.get('type') == 'stirrup' else bends_main_path
+    bend_dims = get_bend_dims(bar_size, bar_bend, bends_path)
+    bar_diameter = get_bar_props(bar_size, props_path).bar_diameter
+
+    return dump_response({
+        'D': bend_dims.D,
+        'A': bend_dims.A,
+        'B': calc_b_dim(bar_diameter, bend_dims.D, int(bar_bend)),
+        'C': bend_dims.C
+    })
+
+def grades_etag():
+    return make_etag(('grades',))
+
+# serialized /grades body with the data version it was built from
+grades_cache = (None, None)
+
+def grades_body():
+    """
+    Returns /grades response body: yield strength (ksi) and gamma_3 factor of
+    every grade designation, serialized once per data version.
+    """
+    global grades_cache
+    version, body = grades_cache
+    if version != data_version():
+        version = data_version()
+        body = dump_response({
+            grade.grade: {'f_y': grade.f_y, 'gamma_3': grade.gamma_3}
+            for grade in load_grade_table(grade_path).values()
+        })
+        grades_cache = (version, body)
+    return body
+
+def metrics_body():
+    """
+    Returns stage timings and /dev-lap cache counters in Prometheus text format (bytes).
+    """
+    stats = dev_lap_cache.stats()
+    samples = [
+        ('rebar_dev_lap_cache_entries', 'gauge', stats['size']),
+        ('rebar_dev_lap_cache_hits_total', 'counter', stats['hits']),
+        ('rebar_dev_lap_cache_misses_total', 'counter', stats['misses']),
+        ('rebar_dev_lap_cache_evictions_total', 'counter', stats['evictions']),
+        ('rebar_dev_lap_cache_expirations_total', 'counter', stats['expirations'])
+    ]
+    return render(samples).encode()
@@ -0,0 +1,105 @@
+import numpy as np
+from config import props_path, sweep_spacings
+from tables import load_props_table
+from dev_lap import calc_steel_area
+from dev_lap_batch import calc_dev_lap_batch
+from unit_conversion import format_ft_in_array
+
+# output key of each length that can be limited, with its calc_dev_lap_batch array
+length_keys = {
+    'tension_development': 'l_d',
+    'tension_hook_development': 'l_dh',
+    'tension_splice': 'ten_lap_len'
+}
+
+def calc_pareto(steel_area, length):
+    """
+    Returns indices of designs not dominated by another with less or equal steel
+    area per foot and a length no longer, ordered by increasing steel area.
+
+    Parameters:
+    - steel_area: Array of steel areas (in²/ft).
+    - length: Array of required lengths (in).
+    """
+    order = np.lexsort((length, steel_area))
+    pareto = []
+    shortest = np.inf
+    for i in order:
+        if length[i] < shortest:
+            pareto.append(i)
+            shortest = length[i]
+    return pareto
+
+def calc_sweep(cover, f_c, f_y, conc_density, max_length, length='tension_splice',
+               epoxy_coat=False, top_bar=False, lambda_er=1, bar_sizes=None,
+               spacings=sweep_spacings, min_steel_area=0, data_path=props_path):
+    """
+    Evaluates every bar size and spacing combination in one vectorized pass and
+    returns the Pareto set minimizing steel area per foot and length among the
+    designs that fit within max_length and provide at least min_steel_area.
+
+    Parameters:
+    - cover: Distance from concrete face to edge of reinforcing bar (in).
+    - f_c: Compressive strength of concrete (ksi).
+    - f_y: Yield strength of reinforcement (ksi).
+    - conc_density: Concrete density (pcf).
+    - max_length: Maximum allowable length (in).
+    - length: Limited length, a key of length_keys.
+    - epoxy_coat: Is rebar epoxy coated? (True/False).
+    - top_bar: Is rebar cast 12" above concrete below? (True/False).
+    - lambda_er: Excess reinforcement factor.
+    - bar_sizes: Standard bar size labels (#), defaults to all sizes.
+    - spacings: Center-to-center spacings of rebar (in).
+    - min_steel_area: Minimum steel area per foot (in²/ft).
+
+    Returns:
+    - list of dicts with size, spacing, steel_area (in²/ft, rounded as
+      calc_steel_area), length (in) and the formatted length, ordered by
+      increasing steel area (and so decreasing length).
+    """
+    if length not in length_keys:
+        raise ValueError(f"Length '{length}' is not one of {', '.join(length_keys)}.")
+    inputs = {
+        'cover': cover,
+        'f_c': f_c,
+        'f_y': f_y,
+        'conc_density': conc_density,
+        'max_length': max_length,
+        'lambda_er': lambda_er,
+        'min_steel_area': min_steel_area
+    }
+    for name, value in inputs.items():
+        if not np.isfinite(value):
+            raise ValueError(f'{name} must be a finite number.')
+    if cover <= 0 or f_c <= 0:
+        raise ValueError('cover and f_c must be positive.')
+    spacings = np.asarray(spacings, dtype=float)
+    if np.any(~np.isfinite(spacings) | (spacings <= 0)):
+        raise ValueError('spacings must be positive finite numbers.')
+    props_table = load_props_table(data_path)
+    if bar_sizes is None:
+        bar_sizes = list(props_table)
+
+    sizes, spacing = np.meshgrid(np.asarray(bar_sizes, dtype=str), spacings, indexing='ij')
+    sizes, spacing = sizes.ravel(), spacing.ravel()
+    lengths = calc_dev_lap_batch(
+        sizes, spacing, cover, f_c, f_y, conc_density,
+        epoxy_coat, top_bar, lambda_er, data_path=data_path
+        )[length_keys[length]]
+    bar_area = np.array([props_table[size].bar_area for size in sizes])
+    steel_area = np.array([calc_steel_area(area, space) for area, space in zip(bar_area.tolist(), spacing.tolist())])
+
+    feasible = np.flatnonzero((lengths <= max_length) & (steel_area >= min_steel_area))
+    pareto = feasible[calc_pareto(steel_area[feasible], lengths[feasible])]
+    formatted = format_ft_in_array(lengths[pareto] / 12, multiple=1, direction='up')
+
+    return [
+        {
+            'size': str(sizes[i]),
+            'spacing': float(spacing[i]),
+            'steel_area': float(steel_area[i]),
+            'length': float(lengths[i]),
+            length: ft_in
+        }
+        for i, ft_in in zip(pareto, formatted)
+    ]
@@ -0,0 +1,288 @@
+import csv
+import hashlib
+import io
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+class BarProps(NamedTuple):
+    """
+    Steel rebar properties for a single bar size.
+    """
+    bar_size: str
+    bar_diameter: float
+    bar_area: float
+    bar_weight: float
+    bar_perimeter: float
+
+class BendDims(NamedTuple):
+    """
+    Standard hook detailing dimensions (in) for a bar size and bend.
+    """
+    bar_size: str
+    bar_bend: str
+    D: float
+    A: float
+    C: float  # None where not applicable
+
+class GradeProps(NamedTuple):
+    """
+    Steel rebar grade designation, e.g. 'A615, Grade 60'.
+    """
+    grade: str
+    f_y: float
+    gamma_3: float
+
+def parse_dim(value: str):
+    """
+    Converts table dimension to float, None for '-'.
+    """
+    return None if value == '-' else float(value)
+
+class TableEntry(NamedTuple):
+    """
+    Parsed data table with the file state it was read from.
+    """
+    table: MappingProxyType
+    mtime_ns: int
+    digest: str
+
+class Snapshot(NamedTuple):
+    """
+    Immutable set of every loaded data table, keyed by (parser, data_path).
+    Replaced as a whole on reload, so a request sees one consistent version.
+    """
+    entries: MappingProxyType
+    version: str
+
+def snapshot_version(entries):
+    """
+    Returns content digest of all tables, identical across worker processes.
+    """
+    digests = ''.join(sorted(f'{path}:{entry.digest};' for (_, path), entry in entries.items()))
+    return hashlib.sha256(digests.encode()).hexdigest()[:16]
+
+_snapshot = Snapshot(MappingProxyType({}), snapshot_version({}))
+# serializes snapshot replacement; readers never lock
+_snapshot_lock = threading.Lock()
+# callbacks run after a reload swaps in new tables, e.g. to clear derived caches
+reload_listeners = []
+
+def read_table(parser, data_path: str):
+    """
+    Reads and parses a csv data table, returning a TableEntry.
+    """
+    mtime_ns = os.stat(data_path).st_mtime_ns
+    with open(data_path, 'rb') as f:
+        raw = f.read()
+    rows = csv.DictReader(io.StringIO(raw.decode(), newline=''))
+    return TableEntry(MappingProxyType(parser(rows)), mtime_ns, hashlib.sha256(raw).hexdigest())
+
+def get_table(parser, data_path: str):
+    """
+    Returns parsed table from the current snapshot, reading it on first use.
+    """
+    global _snapshot
+    entry = _snapshot.entries.get((parser, data_path))
+    if entry is None:
+        with _snapshot_lock:
+            entry = _snapshot.entries.get((parser, data_path))
+            if entry is None:
+                entry = read_table(parser, data_path)
+                entries = {**_snapshot.entries, (parser, data_path): entry}
+                _snapshot = Snapshot(MappingProxyType(entries), snapshot_version(entries))
+    return entry.table
+
+def get_table_digest(parser, data_path: str):
+    """
+    Returns sha256 digest of the file content the current snapshot's table was read from.
+    """
+    get_table(parser, data_path)
+    return _snapshot.entries[(parser, data_path)].digest
+
+def data_version():
+    """
+    Returns version of the loaded data tables, changing whenever a table is reloaded with new content.
+    """
+    return _snapshot.version
+
+def reload_tables():
+    """
+    Re-reads tables whose files changed since they were loaded and atomically
+    swaps in a new snapshot, then runs reload_listeners. A table that fails to
+    read or parse keeps its previous version.
+
+    Returns:
+    - True if a new snapshot was swapped in.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        entries = dict(_snapshot.entries)
+        changed = False
+        for (parser, data_path), entry in list(entries.items()):
+            mtime_ns = None
+            try:
+                mtime_ns = os.stat(data_path).st_mtime_ns
+                if mtime_ns == entry.mtime_ns:
+                    continue
+                new_entry = read_table(parser, data_path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning('Keeping previous %s: %s', data_path, e)
+                if mtime_ns is not None:
+                    # retried on the next change of the file
+                    entries[(parser, data_path)] = entry._replace(mtime_ns=mtime_ns)
+                continue
+            if new_entry.digest != entry.digest:
+                changed = True
+            entries[(parser, data_path)] = new_entry
+        if not changed:
+            # only mtimes moved, keep the version
+            _snapshot = Snapshot(MappingProxyType(entries), _snapshot.version)
+            return False
+        _snapshot = Snapshot(MappingProxyType(entries), snapshot_version(entries))
+
+    logger.info('Reloaded data tables, version %s', _snapshot.version)
+    for listener in reload_listeners:
+        listener()
+    return True
+
+def watch_tables(interval: float):
+    """
+    Starts daemon thread checking data table files for changes every interval (s).
+
+    Returns:
+    - threading.Event stopping the thread when set.
+    """
+    stop = threading.Event()
+
+    def watch():
+        while not stop.wait(interval):
+            try:
+                reload_tables()
+            except Exception:
+                logger.exception('Data table reload failed')
+
+    thread = threading.Thread(target=watch, name='table-watcher', daemon=True)
+    thread.start()
+    return stop
+
+def parse_props_rows(rows):
+    return {
+        row['bar_size']: BarProps(
+            row['bar_size'],
+            float(row['bar_diameter']),
+            float(row['bar_area']),
+            float(row['bar_weight']),
+            float(row['bar_perimeter'])
+            )
+        for row in rows
+    }
+
+def load_props_digest(data_path: str):
+    """
+    Returns digest of the rebar properties file content currently loaded.
+    """
+    return get_table_digest(parse_props_rows, data_path)
+
+def load_props_table(data_path: str):
+    """
+    Returns rebar properties table, read once per path and on file changes.
+
+    Parameters:
+    - data_path: Path to rebar properties csv file.
+
+    Returns:
+    - Read-only mapping of bar size label to BarProps.
+    """
+    return get_table(parse_props_rows, data_path)
+
+def get_bar_props(bar_size: str, data_path: str):
+    """
+    Returns BarProps record for bar size.
+
+    Parameters:
+    - bar_size: Standard bar size label (#).
+    - data_path: Path to rebar properties csv file.
+    """
+    try:
+        return load_props_table(data_path)[bar_size]
+    except KeyError:
+        raise ValueError(f"Bar size '{bar_size}' not found in the properties file.") from None
+
+def parse_bends_rows(rows):
+    return {
+        (row['bar_size'], row['bar_bend']): BendDims(
+            row['bar_size'],
+            row['bar_bend'],
+            parse_dim(row['D']),
+            parse_dim(row['A']),
+            parse_dim(row['C'])
+            )
+        for row in rows
+    }
+
+def load_bends_table(data_path: str):
+    """
+    Returns rebar bends table (bends_main.csv or bends_other.csv), read once
+    per path and on file changes.
+
+    Parameters:
+    - data_path: Path to rebar bends csv file.
+
+    Returns:
+    - Read-only mapping of (bar_size, bar_bend) to BendDims.
+    """
+    return get_table(parse_bends_rows, data_path)
+
+def get_bend_dims(bar_size: str, bar_bend: str, data_path: str):
+    """
+    Returns BendDims record for bar size and bend.
+
+    Parameters:
+    - bar_size: Standard bar size label (#).
+    - bar_bend: Angle of bend (degrees) as in the bends file, e.g. '90'.
+    - data_path: Path to rebar bends csv file.
+    """
+    try:
+        return load_bends_table(data_path)[(bar_size, bar_bend)]
+    except KeyError:
+        raise ValueError(f"Bend '{bar_bend}' not found for bar size '{bar_size}' in the bends file.") from None
+
+def parse_grade_rows(rows):
+    return {
+        row['grade']: GradeProps(
+            row['grade'],
+            float(row['yield']),
+            float(row['gamma_3'])
+            )
+        for row in rows
+    }
+
+def load_grade_table(data_path: str):
+    """
+    Returns rebar grade table, read once per path and on file changes.
+
+    Parameters:
+    - data_path: Path to rebar grade csv file.
+
+    Returns:
+    - Read-only mapping of grade designation to GradeProps.
+    """
+    return get_table(parse_grade_rows, data_path)
+
+def get_grade_props(grade: str, data_path: str):
+    """
+    Returns GradeProps record for grade designation.
+
+    Parameters:
+    - grade: Grade designation as in the grade file, e.g. 'A615, Grade 60'.
+    - data_path: Path to rebar grade csv file.
+    """
+    try:
+        return load_grade_table(data_path)[grade]
+    except (KeyError, TypeError):
+        raise ValueError(f"Grade '{grade}' not found in the grade file.") from None
@@ -0,0 +1,51 @@
+import numpy as np
+from config import props_path
+from tables import load_props_table
+
+def calc_takeoff(bar_size, count, length, add_length=0, data_path=props_path):
+    """
+    Totals developed length and weight of a bar schedule by bar size in one
+    vectorized pass.
+
+    Parameters, one array element per bar mark:
+    - bar_size: Standard bar size labels (#).
+    - count: Number of bars.
+    - length: Straight length of each bar (in).
+    - add_length: Added length of hooks of each bar (in).
+    - data_path: Path to rebar properties csv file.
+
+    Returns:
+    - dict of per size totals (count, length (ft) and weight (lb)) ordered as
+      in the properties file, and the schedule total_length (ft) and total_weight (lb).
+    """
+    props_table = load_props_table(data_path)
+    sizes = np.asarray(bar_size, dtype=str)
+    count = np.asarray(count, dtype=float)
+    length = np.asarray(length, dtype=float) + np.asarray(add_length, dtype=float)
+    if np.any(count < 0) or np.any(length < 0):
+        raise ValueError('Count and length must not be negative.')
+
+    labels, inverse = np.unique(sizes, return_inverse=True)
+    for label in labels:
+        if label not in props_table:
+            raise ValueError(f"Bar size '{label}' not found in the properties file.")
+    bar_weight = np.array([props_table[label].bar_weight for label in labels], dtype=float)
+
+    counts = np.bincount(inverse, weights=count, minlength=len(labels))
+    lengths = np.bincount(inverse, weights=count * length / 12, minlength=len(labels))
+    weights = lengths * bar_weight
+
+    size_order = list(props_table)
+    return {
+        'sizes': [
+            {
+                'size': str(labels[i]),
+                'count': int(counts[i]),
+                'length': round(float(lengths[i]), 2),
+                'weight': round(float(weights[i]), 2)
+            }
+            for i in sorted(range(len(labels)), key=lambda i: size_order.index(labels[i]))
+        ],
+        'total_length': round(float(lengths.sum()), 2),
+        'total_weight': round(float(weights.sum()), 2)
+    }
@@ -0,0 +1,51 @@
+import itertools
+import pytest
+from classes import MainRebarProperties
+from dev_lap import format_whole_in
+from service import extract_data, calc_main_dev_lap
+from config import num_keys, select_keys, main_num_keys, main_select_keys
+
+def main_values(**data):
+    return extract_data(data, num_keys + main_num_keys, select_keys + main_select_keys)
+
+def test_format_whole_in_keeps_exact_inches():
+    assert format_whole_in(20) == '1\'-8"'
+    assert format_whole_in(20.000001) == '1\'-9"'
+    assert format_whole_in(12) == '1\'-0"'
+
+# f_c up to 10 ksi: MainRebarProperties has no f'c > 10 top bar factor
+main_grid = itertools.product(
+    ['#3', '#4', '#5', '#7', '#8', '#11', '#14'], [4, 6, 12], [1, 3, 4], [3, 4, 5, 8], [60, 80], [1.5, 2, 3],
+    [False, True], [False, True], ['A', 'B'], [150, 110], [0, 0.5], [1, 0.8]
+)
+
+def test_main_dev_lap_matches_main_rebar_properties():
+    for size, spacing, bundle, f_c, f_y, cover, top_bar, epoxy_coat, lap_class, density, as_req, lambda_rc in main_grid:
+        reference = MainRebarProperties(size, spacing, bundle)
+        coating = 'epoxy' if epoxy_coat else 'none'
+        concrete_type = 'normal' if density == 150 else 'light'
+        tension = reference.return_tension_lengths(
+            f_c, f_y, cover, 'top' if top_bar else 'bottom', coating, lap_class, concrete_type, density, as_req
+            )
+        hook = reference.return_hook_length(f_c, f_y, coating, concrete_type, density, lambda_rc, as_req)
+        compression = reference.return_compression_lengths(f_c, f_y, lambda_rc, 1, as_req)
+        values = main_values(
+            size=size, spacing=spacing, cover=cover, f_c=f_c, f_y=f_y, concDensity=density,
+            bundle=bundle, As_req=as_req, lambda_rc=lambda_rc, lap_class=lap_class,
+            epoxy_coat='yes' if epoxy_coat else 'no', top_bar='yes' if top_bar else 'no'
+            )
+        assert calc_main_dev_lap(values) == {
+            'tension_development': tension['Development Length'],
+            'tension_hook_development': hook['Development Length'],
+            'tension_splice': tension['Lap Splice Length'],
+            'compression_development': compression['Development Length'],
+            'compression_splice': compression['Lap Splice Length'],
+            'steel_area': reference.steel_area
+        }, values
+
+@pytest.mark.parametrize('missing', ['spacing', 'f_c'])
+def test_main_dev_lap_rejects_missing_inputs(missing):
+    data = {'size': '#5', 'spacing': 6, 'cover': 2, 'f_c': 4, 'f_y': 60, 'concDensity': 150}
+    del data[missing]
+    with pytest.raises(ValueError):
+        calc_main_dev_lap(main_values(**data))
@@ -0,0 +1,22 @@
+import itertools
+import pytest
+from dev_lap import ConcreteBeam, RebarDevLap
+from dev_lap_batch import calc_dev_lap_batch
+from tables import load_props_table
+from config import props_path
+
+# covers epoxy coating (both lambda_cf branches), top bars, f'c above 10 ksi,
+# lightweight concrete, excess reinforcement and the 12" minimum
+grid = list(itertools.product(
+    list(load_props_table(props_path)), [3, 4.5, 6, 12, 18], [0.75, 1.5, 2, 3], [2.5, 4, 6, 10, 12], [40, 60, 80],
+    [90, 115, 150], [False, True], [False, True], [1, 0.6]
+))
+
+@pytest.mark.parametrize('lambda_rc, lap_class', [(1, 'B'), (0.8, 'A')])
+def test_calc_dev_lap_batch_matches_scalar_path(lambda_rc, lap_class):
+    lengths = calc_dev_lap_batch(*zip(*grid), lambda_rc=lambda_rc, lap_class=lap_class)
+    for i, (size, spacing, cover, f_c, f_y, density, epoxy_coat, top_bar, lambda_er) in enumerate(grid):
+        beam = ConcreteBeam(size, spacing, cover, f_c, f_y, density)
+        expected = RebarDevLap(beam, epoxy_coat, top_bar, lambda_er).calc_dev_lap(lambda_rc, lap_class)
+        # bit-identical, not approximately equal
+        assert (lengths['l_d'][i], lengths['l_dh'][i], lengths['ten_lap_len'][i]) == tuple(expected), grid[i]
@@ -0,0 +1,27 @@
+import pytest
+from sweep import calc_sweep, calc_pareto
+
+def front(results):
+    return [(result['size'], result['spacing'], result['steel_area'], result['tension_splice']) for result in results]
+
+def test_sweep_returns_least_steel_design():
+    # #4@4" meets the minimum steel area with the shortest splice; #4@3" (more
+    # steel, same splice) and #7@12" (same steel, longer splice) are dominated
+    results = calc_sweep(2, 4, 60, 150, 36, min_steel_area=0.6)
+    assert front(results) == [('#4', 4.0, 0.6, '1\'-7"')]
+
+def test_sweep_front_trades_steel_area_for_length():
+    results = calc_sweep(2, 4, 60, 150, 60, min_steel_area=1.5)
+    assert front(results) == [('#9', 8.0, 1.5, '3\'-11"'), ('#6', 3.5, 1.51, '2\'-7"')]
+    assert all(result['length'] <= 60 for result in results)
+
+def test_calc_pareto_minimizes_both():
+    steel_area = [0.8, 0.6, 0.6, 1.0, 0.4]
+    length = [18.0, 18.0, 30.0, 12.0, 40.0]
+    assert calc_pareto(steel_area, length) == [4, 1, 3]
+
+@pytest.mark.parametrize('kwargs', [{'spacings': [0]}, {'spacings': [-6, 6]}, {'max_length': float('inf')}, {'cover': 0}, {'f_c': -4}])
+def test_sweep_rejects_invalid_inputs(kwargs):
+    inputs = {'cover': 2, 'f_c': 4, 'f_y': 60, 'conc_density': 150, 'max_length': 36, **kwargs}
+    with pytest.raises(ValueError):
+        calc_sweep(**inputs)
@@ -0,0 +1,58 @@
+import os
+import shutil
+import time
+import tables
+import service
+from config import props_path
+
+def edit_props(path, old, new):
+    with open(path) as f:
+        text = f.read()
+    with open(path, 'w') as f:
+        f.write(text.replace(old, new))
+    # make the change visible on filesystems with coarse mtimes
+    mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_reload_swaps_version_props_body_and_etag(tmp_path, monkeypatch):
+    path = str(tmp_path / 'props.csv')
+    shutil.copy(props_path, path)
+    monkeypatch.setattr(service, 'props_path', path)
+    # the table built from path is dropped again after the test
+    monkeypatch.setattr(service, 'props_table_cache', service.props_table_cache)
+    tables.load_props_table(path)
+    request = {'type': 'main', 'size': '#8', 'bend': '90'}
+    version = tables.data_version()
+    body = service.props_body(request)
+    etag = service.props_etag(request)
+    assert b'"bar_diameter":1.0' in body
+
+    edit_props(path, '#8,1,', '#8,1.5,')
+    assert tables.reload_tables()
+
+    assert tables.data_version() != version
+    assert b'"bar_diameter":1.5' in service.props_body(request)
+    assert service.props_etag(request) != etag
+
+def test_unchanged_content_keeps_version(tmp_path):
+    path = str(tmp_path / 'props.csv')
+    shutil.copy(props_path, path)
+    tables.load_props_table(path)
+    version = tables.data_version()
+    edit_props(path, '', '')
+    assert not tables.reload_tables()
+    assert tables.data_version() == version
+
+def test_watch_tables_reloads_until_stopped(tmp_path):
+    path = str(tmp_path / 'props.csv')
+    shutil.copy(props_path, path)
+    tables.load_props_table(path)
+    stop = tables.watch_tables(0.01)
+    try:
+        edit_props(path, '#8,1,', '#8,1.5,')
+        deadline = time.monotonic() + 5
+        while tables.load_props_table(path)['#8'].bar_diameter != 1.5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert tables.load_props_table(path)['#8'].bar_diameter == 1.5
+    finally:
+        stop.set()
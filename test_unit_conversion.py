@@ -0,0 +1,100 @@
+import math
+import random
+import pytest
+from unit_conversion import return_ft_in, format_ft_in, format_ft_in_array, parse_feet, parse_dimension, return_feet
+
+# 0 to 1000 ft in 1/16" steps
+sixteenths_ft = [i / (12 * 16) for i in range(1000 * 12 * 16 + 1)]
+# (multiple, direction) pairs used by the service: /props dimensions and rounded up lengths
+roundings = [(1/16, 'nearest'), (1, 'up')]
+
+@pytest.fixture(autouse=True)
+def clear_format_cache():
+    format_ft_in.cache_clear()
+    yield
+    format_ft_in.cache_clear()
+
+@pytest.mark.parametrize('multiple, direction', roundings)
+def test_format_ft_in_matches_return_ft_in(multiple, direction):
+    for number_ft in sixteenths_ft:
+        assert format_ft_in(number_ft, multiple, direction) == return_ft_in(number_ft, multiple, direction)[1], number_ft
+
+@pytest.mark.parametrize('multiple, direction', roundings)
+def test_format_ft_in_matches_return_ft_in_between_steps(multiple, direction):
+    # values just off the 1/16" grid, as produced by the length calculations
+    for number_ft in sixteenths_ft[::7]:
+        for value in (number_ft * 1.0000001, number_ft + 1e-9, max(number_ft - 1e-9, 0)):
+            assert format_ft_in(value, multiple, direction) == return_ft_in(value, multiple, direction)[1], value
+
+@pytest.mark.parametrize('multiple, direction', roundings + [(1/10, 'nearest'), (0, 'up'), (1/4, 'down')])
+@pytest.mark.parametrize('number_ft', [math.nan, math.inf, -math.inf, -1.5, -1 / 192, 0.0])
+def test_format_ft_in_fallbacks(number_ft, multiple, direction):
+    assert format_ft_in(number_ft, multiple, direction) == return_ft_in(number_ft, multiple, direction)[1]
+
+@pytest.mark.parametrize('multiple, direction', roundings + [(1/10, 'nearest'), (1/4, 'down')])
+def test_format_ft_in_array_matches_format_ft_in(multiple, direction):
+    numbers_ft = sixteenths_ft[::13] + [number_ft * 1.0000001 for number_ft in sixteenths_ft[::29]]
+    expected = [format_ft_in(number_ft, multiple, direction) for number_ft in numbers_ft]
+    assert format_ft_in_array(numbers_ft, multiple, direction) == expected
+
+@pytest.mark.parametrize('numbers_ft', [[math.nan, 1.5, math.inf], [2.25, -1.5, 0.0]])
+def test_format_ft_in_array_fallbacks(numbers_ft):
+    expected = [format_ft_in(number_ft) for number_ft in numbers_ft]
+    assert format_ft_in_array(numbers_ft) == expected
+
+def dimension_strings():
+    """
+    Returns dimension strings in every supported format, edge cases and seeded random strings.
+    """
+    strings = [
+        "12", "12'", "12.5'", "5'-6\"", "5'-6 1/2\"", "5'-1/2\"", "6\"", "6.5\"", "6 1/2\"", "1/2\"",
+        "5-6", "-5'", "5' - 6\"", "0 1/2\"", "-0 1/2\"", "6 1/0\"", "5'-6 3/0\"", ".5", ".5\"", "5.'",
+        "1e3", "inf", "nan", "5'6\"", "5'-6\"-3", "", "\"", "'", "-", "1_000", "6\t1/2\"", "  5  ",
+        "5'-00\"", "007'-03 05/08\"", "5'-6.25", "3/4", "10 3/4\"", "1'-1/0\""
+    ]
+    for feet in range(0, 40, 3):
+        for inches in range(12):
+            for numerator, denominator in [(1, 2), (3, 8), (15, 16), (2, 4), (6, 3)]:
+                strings += [
+                    f"{feet}'-{inches} {numerator}/{denominator}\"",
+                    f"{feet}'-{inches}\"",
+                    f"{inches} {numerator}/{denominator}\"",
+                    f"{feet}.{inches}'",
+                    f"{feet}-{inches}.{numerator}{denominator}"
+                ]
+    rng = random.Random(1)
+    alphabet = list("0123456789'\"- /.") + ['1/2', '3/4', ' ', '12', '00', '1/0', 'e', 'x']
+    strings += [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 9))) for _ in range(20000)]
+    return strings
+
+def test_parse_feet_matches_parse_dimension():
+    for string_num in dimension_strings():
+        try:
+            expected = parse_dimension(string_num)
+        except Exception:
+            with pytest.raises(ValueError):
+                parse_feet(string_num)
+            assert return_feet(string_num) == 'error &#128565;'
+            continue
+        result = parse_feet(string_num)
+        assert result == expected or (math.isnan(result) and math.isnan(expected)), string_num
+
+# formats outside dimension_re, as parsed by the original return_feet
+@pytest.mark.parametrize('string_num, feet', [
+    ('5-6', 5.5),
+    ("5'-6.25", 5.520833333333333),
+    ('5\'- 1/2"', 5.041666666666667),
+    ('1e3', 1000.0),
+    ('1_000', 1000.0),
+    ('  5  ', 5.0),
+    ('5\'-6"-3', 5.5)
+])
+def test_parse_dimension_legacy_formats(string_num, feet):
+    assert parse_dimension(string_num) == feet
+    assert parse_feet(string_num) == feet
+
+@pytest.mark.parametrize('string_num', ['-0 1/2"', '-1 1/2"', '6 1/0"', '--1/2"', '1\'-1/0"', '6\t1/2"'])
+def test_parse_feet_legacy_errors(string_num):
+    with pytest.raises(ValueError):
+        parse_feet(string_num)
+    assert return_feet(string_num) == 'error &#128565;'
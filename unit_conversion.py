@@ -1,63 +1,127 @@
 import math
 from fractions import Fraction
+from functools import lru_cache
 import re
 
-def return_feet(string_num):
+fraction_re = re.compile(r"^(-?)*(?:(\d+)\s)?(\d+)\/(\d+)$")
 
-    def cln_dec(dec_num, dec_len=4):
-        cln_num = ("{:." + str(dec_len) + "f}").format(dec_num).rstrip('0').rstrip('.')
-        return(cln_num)
+# common dimension formats: #', #'-#", #'-# #/#", #" and # #/#"
+inches_pattern = r"\d+(?:\.\d+)?|(?:\d+ )?\d+/\d+"
+dimension_re = re.compile(
+    r"(?P<feet>\d+(?:\.\d+)?)'?(?:-(?P<inches>" + inches_pattern + r')"?)?'
+    r'|(?P<inches_only>' + inches_pattern + r')"'
+)
 
-    def fraction_to_decimal(fract_str):
-        '''
-        fract_str : string fraction or mixed number
-        returns float
-        '''
-        # check if fraction or mixed number
-        if re.search("^(-?)*(?:(\d+)\s)?(\d+)\/(\d+)$", fract_str):
-            # decimal or fraction
-            try:
-                whole_num = int(fract_str.split(' ')[0])
-                decimal_num = float(Fraction(fract_str.split(' ')[1]))
-                output = whole_num + math.copysign(decimal_num, whole_num)
-            # mixed number
-            except:
-                output = float(Fraction(fract_str))
-            return(output)
-        else:
-            raise ValueError('Must be a fraction')
 
-    def ft_in_to_feet(ft_in_num):
-        '''
-        ft_in_num : string
-        returns float decimal
-        '''
-        feet_str = ft_in_num.split('-')[0].replace('\'', '')
-        inches_str = ft_in_num.split('-')[1].replace('"', '')
-        # inches as fraction
+def fraction_to_decimal(fract_str):
+    '''
+    fract_str : string fraction or mixed number
+    returns float, the fraction taking the sign of a mixed number's whole part
+    '''
+    if not fraction_re.search(fract_str):
+        raise ValueError('Must be a fraction')
+    whole_str, space, fraction_str = fract_str.partition(' ')
+    # fraction
+    if not space:
+        return float(Fraction(fract_str))
+    # mixed number
+    whole_num = int(whole_str)
+    decimal_num = float(Fraction(fraction_str))
+    return whole_num + math.copysign(decimal_num, whole_num)
+
+
+def ft_in_to_feet(ft_in_num):
+    '''
+    ft_in_num : string
+    returns float decimal
+    '''
+    feet_str = ft_in_num.split('-')[0].replace('\'', '')
+    inches_str = ft_in_num.split('-')[1].replace('"', '')
+    feet = float(feet_str)
+    # inches as fraction or mixed number
+    if fraction_re.search(inches_str):
+        return feet + fraction_to_decimal(inches_str) / 12
+    # inches as decimal
+    return feet + float(Fraction(inches_str)) / 12
+
+
+def inches_to_decimal(inches_str):
+    '''
+    inches_str : string decimal, fraction or mixed number matched by inches_pattern
+    returns float
+    '''
+    if '/' not in inches_str:
+        return float(inches_str)
+    whole_str, _, fraction_str = inches_str.rpartition(' ')
+    numerator, denominator = fraction_str.split('/')
+    if denominator.strip('0') == '':
+        raise ValueError('Fraction denominator is zero')
+    return (int(whole_str) if whole_str else 0) + int(numerator) / int(denominator)
+
+
+def parse_dimension(string_num):
+    '''
+    string_num : string feet, feet-inches or inches
+    returns float feet, parsing formats outside dimension_re as return_feet always has
+    '''
+    # input formatted as #'-#"
+    if '-' in string_num:
+        return ft_in_to_feet(string_num)
+    # input formatted as #"
+    elif '"' in string_num:
+        inches_str = string_num.replace('"', '')
+        if fraction_re.search(inches_str):
+            return fraction_to_decimal(inches_str) / 12
+        return float(inches_str) / 12
+    # input assumed as feet
+    else:
+        return float(string_num.replace('\'', ''))
+
+
+@lru_cache(maxsize=65536)
+def parse_feet(string_num):
+    '''
+    string_num : string feet, feet-inches or inches
+    returns float feet, raises ValueError if string is not a dimension
+    '''
+    match = dimension_re.fullmatch(string_num)
+    if match is None:
         try:
-            feet = float(feet_str) + fraction_to_decimal(inches_str) / 12
-        # inches as decimal
-        except:
-            feet = float(feet_str) + float(Fraction(inches_str)) / 12
-        return(feet)
+            return parse_dimension(string_num)
+        except Exception as e:
+            raise ValueError(f"Could not parse dimension '{string_num}'.") from e
+
+    inches_only = match.group('inches_only')
+    if inches_only is not None:
+        return inches_to_decimal(inches_only) / 12
+    feet = float(match.group('feet'))
+    inches = match.group('inches')
+    if inches is None:
+        return feet
+    return feet + inches_to_decimal(inches) / 12
+
+
+def parse_many(strings):
+    '''
+    strings : iterable of dimension strings
+    returns float array of feet (nan where invalid) and boolean error mask
+    '''
+    import numpy as np  # imported on first use to keep app start-up light
+    strings = list(strings)
+    feet = np.full(len(strings), np.nan)
+    errors = np.zeros(len(strings), dtype=bool)
+    for i, string_num in enumerate(strings):
+        try:
+            feet[i] = parse_feet(string_num)
+        except (ValueError, TypeError):
+            errors[i] = True
+    return feet, errors
+
 
+def return_feet(string_num):
     try:
-        # input formatted as #'-#"
-        if '-' in string_num:
-            feet_num = ft_in_to_feet(string_num)
-        # input formatted as #"
-        elif '"' in string_num:
-            try:
-                feet_num = fraction_to_decimal(string_num.replace('"', '')) / 12
-            except:
-                feet_num = float(string_num.replace('"', '')) / 12
-        # input assumed as feet
-        else:
-            feet_num = float(string_num.replace('\'', ''))
-        feet_num = feet_num
-        return(feet_num)
-    except:
+        return parse_feet(string_num)
+    except Exception:
         return('error &#128565;')
 
 
@@ -112,5 +176,79 @@ def return_ft_in(number_ft, multiple=1/16, direction='nearest'):
         num_list.append(ft_in_num)
         num_list.append(cln_dec(feet_num * 12) + '"')
         return(num_list)
-    except:
+    except Exception:
         return(['', '', ''])
+
+
+def sixteenths_to_in(sixteenths):
+    '''
+    sixteenths : int
+    returns string whole inches with reduced fraction
+    '''
+    whole_num, numerator = divmod(sixteenths, 16)
+    if numerator == 0:
+        return str(whole_num)
+    denominator = 16
+    while numerator % 2 == 0:
+        numerator //= 2
+        denominator //= 2
+    return str(whole_num) + ' ' + str(numerator) + '/' + str(denominator)
+
+# inch strings for 0 to 12 inches in 1/16" steps
+in_strings = tuple(sixteenths_to_in(sixteenths) for sixteenths in range(12 * 16 + 1))
+
+
+@lru_cache(maxsize=4096)
+def format_ft_in(number_ft, multiple=1/16, direction='nearest'):
+    '''
+    number_ft : float
+    returns string #'-#", same as return_ft_in(number_ft, multiple, direction)[1]
+
+    Uses integer sixteenths arithmetic when multiple is a multiple of 1/16".
+    '''
+    sixteenths_per_step = multiple * 16
+    if sixteenths_per_step <= 0 or sixteenths_per_step != int(sixteenths_per_step) or number_ft < 0:
+        return return_ft_in(number_ft, multiple, direction)[1]
+
+    step = multiple / 12
+    try:
+        if direction == 'up':
+            feet_num = step * math.ceil(number_ft / step)
+        elif direction == 'down':
+            feet_num = step * math.floor(number_ft / step)
+        else:
+            feet_num = step * round(number_ft / step)
+    except (ValueError, OverflowError):
+        return ''
+
+    sixteenths = round((feet_num % 1) * 12 * 16)
+    return str(int(feet_num)) + '\'-' + in_strings[sixteenths] + '"'
+
+
+def format_ft_in_array(numbers_ft, multiple=1/16, direction='nearest'):
+    '''
+    numbers_ft : array of floats
+    returns list of strings #'-#", same as format_ft_in for each value
+    '''
+    import numpy as np
+    numbers_ft = np.asarray(numbers_ft, dtype=float)
+    sixteenths_per_step = multiple * 16
+    if sixteenths_per_step <= 0 or sixteenths_per_step != int(sixteenths_per_step) or (numbers_ft < 0).any():
+        return [format_ft_in(float(number_ft), multiple, direction) for number_ft in numbers_ft.ravel()]
+
+    step = multiple / 12
+    with np.errstate(invalid='ignore'):
+        if direction == 'up':
+            feet_num = step * np.ceil(numbers_ft.ravel() / step)
+        elif direction == 'down':
+            feet_num = step * np.floor(numbers_ft.ravel() / step)
+        else:
+            feet_num = step * np.round(numbers_ft.ravel() / step)
+        finite = np.isfinite(feet_num)
+        feet = np.where(finite, feet_num, 0).astype(np.int64)
+        sixteenths = np.where(finite, np.round((feet_num % 1) * 12 * 16), 0).astype(np.int64)
+
+    return [
+        str(ft) + '\'-' + in_strings[sixteenth] + '"' if is_finite else ''
+        for ft, sixteenth, is_finite in zip(feet.tolist(), sixteenths.tolist(), finite.tolist())
+    ]